@@ -15,13 +15,17 @@
 parts of the library.
 
 If possible, internal Sympy classes and methods are chosen instead of Python
-built-ins for optimization.
+built-ins for optimization. When the operands are already numeric, as in an
+already solved penetrance table, the numeric variants are preferred.
 """
 
 import functools
 import inspect
 import itertools
-from typing import List, Union
+import operator
+from decimal import Decimal
+from fractions import Fraction
+from typing import List, Tuple, Union
 
 from sympy import Integer, Rational, Expr, Add, Mul, Pow, nsimplify, simplify
 
@@ -239,6 +243,134 @@ def compute_heritability(
         raise GenericCalculationError(inspect.getframeinfo(frame).function)
 
 
+def _numeric_as_scaled_integers(
+    values: Union[List[Rational], List[float]]
+) -> Tuple[List[int], int]:
+    """Exact integers of the shortest decimal representation of some numbers,
+    as `nsimplify` does with floats (e.g. `3/10` for `0.3`), all scaled by
+    the same power of ten. Integers are much faster to operate with than
+    rationals.
+
+    Parameters
+    ----------
+    values : Union[list[Rational], list[float]]
+        Numbers to represent.
+
+    Returns
+    -------
+    Tuple[list[int], int]
+        The scaled integers and the scale, the power of ten which divides
+        them to get the numbers.
+    """
+    decimals = [Decimal(repr(float(v))) for v in values]
+    exponent = max(0, -min(d.as_tuple().exponent for d in decimals))
+    return [int(d.scaleb(exponent)) for d in decimals], 10 ** exponent
+
+
+def _scaled_genotype_probabilities(
+    mafs: Union[List[Rational], List[float]]
+) -> Tuple[List[int], int]:
+    """Numeric variant of `genotype_probabilities`, as scaled integers like
+    `_numeric_as_scaled_integers` returns, so they are exact. The order of
+    the probabilities is the same. Also returns the scale."""
+    gp, gp_scale = [1], 1
+    for maf in mafs:
+        [m], scale = _numeric_as_scaled_integers([maf])
+        M = scale - m
+        # Outer product with the `[M ** 2, 2 * M * m, m ** 2]` probabilities
+        gp = [g * q for g in gp for q in (M * M, 2 * M * m, m * m)]
+        gp_scale *= scale * scale
+
+    return gp, gp_scale
+
+
+def compute_numeric_prevalence(
+    penetrances: Union[List[Rational], List[float]],
+    mafs: Union[List[Rational], List[float]],
+) -> float:
+    """Numeric variant of `compute_prevalence`, for penetrances that are
+    already numeric values. Computed exactly from the decimal value of each
+    operand, as the symbolic variant, so the result is correctly rounded
+    and has no floating point noise.
+
+    Parameters
+    ----------
+    penetrances : Union[list[Rational], list[float]]
+        Penetrance values array.
+    mafs : Union[list[Rational], list[float]]
+        Minor allele frequencies array.
+
+    Returns
+    -------
+    float
+        Prevalence of the penetrance table.
+
+    Raises
+    ------
+    GenericCalculationError
+        On any error situation.
+    """
+    try:
+        penetrances, penetrances_scale = _numeric_as_scaled_integers(penetrances)
+        gp, gp_scale = _scaled_genotype_probabilities(mafs)
+
+        # Integer division is correctly rounded
+        return sum(map(operator.mul, penetrances, gp)) / (penetrances_scale * gp_scale)
+
+    except:
+        frame = inspect.currentframe()
+        raise GenericCalculationError(inspect.getframeinfo(frame).function)
+
+
+def compute_numeric_heritability(
+    penetrances: Union[List[Rational], List[float]],
+    mafs: Union[List[Rational], List[float]],
+) -> float:
+    """Numeric variant of `compute_heritability`, for penetrances that are
+    already numeric values. Computed exactly from the decimal value of each
+    operand, as the symbolic variant, so the result is correctly rounded
+    and has no floating point noise.
+
+    Parameters
+    ----------
+    penetrances : Union[list[Rational], list[float]]
+        Penetrance values array.
+    mafs : Union[list[Rational], list[float]]
+        Minor allele frequencies array.
+
+    Returns
+    -------
+    float
+        Heritability of the penetrance table.
+
+    Raises
+    ------
+    GenericCalculationError
+        On any error situation.
+    """
+    try:
+        penetrances, penetrances_scale = _numeric_as_scaled_integers(penetrances)
+        gp, gp_scale = _scaled_genotype_probabilities(mafs)
+
+        # As `compute_heritability`, with the prevalence as a 15 digits Float
+        p = sum(map(operator.mul, penetrances, gp)) / (penetrances_scale * gp_scale)
+        p = Fraction(f"{p:.15g}")
+        p_num, p_den = p.numerator, p.denominator
+
+        # `sum((penetrances - p).^2 .* gp) / (p * (1 - p))`, with integers
+        numerator = sum(
+            (pen * p_den - p_num * penetrances_scale) ** 2 * prob
+            for pen, prob in zip(penetrances, gp)
+        )
+        return numerator / (
+            penetrances_scale ** 2 * gp_scale * p_num * (p_den - p_num)
+        )
+
+    except:
+        frame = inspect.currentframe()
+        raise GenericCalculationError(inspect.getframeinfo(frame).function)
+
+
 def _try_to_simplify(expr: Expr, timeout: int = 60, model_order: int = None):
     """Help function which encapsulate the a call to an attempt to simplify an
     expression with a maximum timeout. If the expression could not be simplified
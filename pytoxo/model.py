@@ -13,6 +13,7 @@
 
 """Epistasis model definition."""
 
+import functools
 import itertools
 import os
 import string
@@ -490,6 +491,15 @@ class Model:
     def tolerable_solution_error_delta(self) -> float:
         return self._tolerable_solution_error_delta
 
+    @functools.cached_property
+    def genotypes(self) -> numpy.ndarray:
+        # Only depends on the order, so it is computed once and shared by
+        # all the penetrance tables generated from this model. Read-only,
+        # because it is shared
+        genotypes = numpy.array(self.calculate_genotypes())
+        genotypes.flags.writeable = False
+        return genotypes
+
     ########################################
 
     def __hash__(self):
@@ -808,13 +818,14 @@ class Model:
         # Return the final achieved solution as penetrance table object
         return pytoxo.ptable.PTable(
             model_order=self._order,
-            model_genotypes=self.calculate_genotypes(),
+            model_genotypes=self.genotypes,
             model_penetrances=self._penetrances,
             values={
                 self._variables[0]: sol[self._variables[0]],
                 self._variables[1]: sol[self._variables[1]],
             },
             mafs=mafs,
+            heritability=h,
         )
 
     def _build_max_heritability_system(
@@ -902,13 +913,14 @@ class Model:
         # Return the final achieved solution as penetrance table object
         return pytoxo.ptable.PTable(
             model_order=self._order,
-            model_genotypes=self.calculate_genotypes(),
+            model_genotypes=self.genotypes,
             model_penetrances=self._penetrances,
             values={
                 self._variables[0]: sol[self._variables[0]],
                 self._variables[1]: sol[self._variables[1]],
             },
             mafs=mafs,
+            prevalence=p,
         )
 
     def check_find_table_parameters(
@@ -13,27 +13,111 @@
 
 """Penetrance table definition."""
 
+import csv
+import functools
+import math
 import os
+import stat
+import sys
 
 import numpy
 import sympy
-from typing import List, Dict
+from typing import Callable, List, Dict, TextIO, Tuple, Union
 
 import pytoxo.calculations
 import pytoxo.errors
 
 
+@functools.lru_cache(maxsize=32)
+def _penetrances_function(
+    variables: Tuple[sympy.Symbol, ...], penetrances: Tuple[sympy.Expr, ...]
+) -> Callable:
+    """Translates the penetrance expressions of a model to a numeric Python
+    function of the model variables, which returns all the penetrances at
+    once. Cached, because all the tables of a model share the expressions.
+
+    The penetrance expressions of a model share a lot of subexpressions
+    (e.g. the powers of `(1 + y)`), so a common subexpression elimination is
+    done before. The source of a function specialized for the model is
+    generated with an assignment per common subexpression, so each one is
+    evaluated only once per call, and a return of all the reduced
+    penetrances.
+
+    Parameters
+    ----------
+    variables : tuple[sympy.Symbol, ...]
+        The model variables, in the order of the function arguments.
+    penetrances : tuple[sympy.Expr, ...]
+        The penetrance expressions of the model.
+
+    Returns
+    -------
+    Callable
+        Function which receives the variable values and returns the list
+        of penetrance values.
+    """
+    replacements, reduced_penetrances = sympy.cse(list(penetrances))
+
+    # Generate the source of the function
+    arguments = ", ".join(str(variable) for variable in variables)
+    source = [f"def penetrances_function({arguments}):"]
+    for symbol, subexpression in replacements:
+        source.append(f"    {symbol} = {sympy.pycode(subexpression)}")
+    returned = ", ".join(sympy.pycode(p) for p in reduced_penetrances)
+    source.append(f"    return [{returned}]")
+
+    # Compile it. The printer uses the `math` module for the functions
+    namespace = {"math": math}
+    exec("\n".join(source), namespace)
+    return namespace["penetrances_function"]
+
+
+@functools.lru_cache(maxsize=None)
+def _gametes_attribute_names(order: int) -> str:
+    """Returns the GAMETES attribute names field for a table of the given
+    order: `P0`, `P1`, ... separated by tabs. Cached, because it only depends
+    on the order."""
+    return "\t".join(f"P{i}" for i in range(0, order))
+
+
+def _format_penetrance(penetrance: float) -> str:
+    """Returns the text of a penetrance value with 15 significant digits,
+    keeping trailing zeros, as Sympy prints its Floats. Python pads the
+    exponent with zeros (`1.23456789000000e-05`) and prints zero with all its
+    digits, while Sympy does not (`1.23456789000000e-5` and `0.0`)."""
+    if penetrance == 0:
+        return "0.0"
+    text = f"{penetrance:#.15g}"
+    if "e" in text:
+        mantissa, exponent = text.split("e")
+        text = f"{mantissa}e{int(exponent)}"
+    return text
+
+
 class PTable:
     """Representation of a penetrance table."""
 
+    __slots__ = (
+        "_order",
+        "_genotypes",
+        "_penetrance_values",
+        "_values",
+        "_model_name",
+        "_mafs",
+        "_prevalence",
+        "_heritability",
+    )
+
     def __init__(
         self,
         model_order: int,
-        model_genotypes: List[str],
+        model_genotypes: Union[List[str], numpy.ndarray],
         model_penetrances: List[sympy.Expr],
         values: Dict[sympy.Symbol, float],
         mafs: List[float] = None,
         model_name: str = None,
+        prevalence: float = None,
+        heritability: float = None,
     ):
         """Creates a penetrance table from a given PyToxo model defined by
         its variables and penetrances, and its variable values.
@@ -43,9 +127,9 @@ class PTable:
         model_order : int
             Order from the PyToxo model from which to create the penetrance
             table.
-        model_genotypes : List[str]
-            List of the genotype definitions like generated by
-            `_calculate_genotypes` PyToxo model method.
+        model_genotypes : Union[List[str], numpy.ndarray]
+            List or Numpy array of the genotype definitions like generated
+            by `calculate_genotypes` PyToxo model method.
         model_penetrances : List[sympy.Expr]
             Penetrances from the PyToxo model from which to create the
             penetrance table.
@@ -59,105 +143,143 @@ class PTable:
         model_name: str, optional
             Optional value of the model which compound this table,
             to identify it easily.
+        prevalence : float, optional
+            The prevalence fixed to generate the table, if any. Optional
+            parameter, only used to save the table using GAMETES format,
+            where it is calculated from the table if not given.
+        heritability : float, optional
+            The heritability fixed to generate the table, if any. Optional
+            parameter, only used to save the table using GAMETES format,
+            where it is calculated from the table if not given.
         """
         self._order = model_order
-        self._genotypes = model_genotypes
-        self._penetrance_values = [
-            p.subs(values) for p in model_penetrances
-        ]  # Try to substitute `y` in expression `x` does not cause errors, simply are ignored
+        self._genotypes = numpy.asarray(
+            model_genotypes, dtype=numpy.str_
+        ).view()  # Contiguous buffer. No copy if it is already the model's array
+        self._genotypes.flags.writeable = False  # It can be shared
+        penetrances_function = _penetrances_function(
+            tuple(values.keys()), tuple(model_penetrances)
+        )  # Variables not present in an expression are simply ignored
+        """Penetrances are probabilities. Clipping only discards the floating
+        point noise at the bounds (e.g. `1.0000000000000002`)"""
+        self._penetrance_values = numpy.clip(
+            numpy.asarray(
+                penetrances_function(*[float(v) for v in values.values()]),
+                dtype=numpy.float64,
+            ),
+            0.0,
+            1.0,
+        )
+        self._penetrance_values.flags.writeable = False  # It is hashed
         self._values = list(values.values())  # Only used to save to GAMETES
         self._model_name = model_name
         self._mafs = mafs  # Only used to save to GAMETES
-        self._prevalence = None  # Only used to save to GAMETES
-        self._heritability = None  # Only used to save to GAMETES
+        self._prevalence = prevalence  # Only used to save to GAMETES
+        self._heritability = heritability  # Only used to save to GAMETES
 
     ########################################
     # Getters and setters for properties
 
-    def _get_model_name(self) -> str:
+    @property
+    def model_name(self) -> str:
         return self._model_name
 
-    def _set_model_name(self, model_name: str) -> None:
+    @model_name.setter
+    def model_name(self, model_name: str) -> None:
         self._model_name = model_name
 
-    model_name = property(_get_model_name, _set_model_name)
-
-    def _get_mafs(self) -> List[float]:
+    @property
+    def mafs(self) -> List[float]:
         return self._mafs
 
-    def _set_mafs(self, mafs: List[float]) -> None:
+    @mafs.setter
+    def mafs(self, mafs: List[float]) -> None:
+        if mafs != self._mafs:  # Prevalence and heritability depend on them
+            self._prevalence = None
+            self._heritability = None
         self._mafs = mafs
 
-    mafs = property(_get_mafs, _set_mafs)
-
-    def _get_prevalence(self) -> float:
+    @property
+    def prevalence(self) -> float:
         return self._prevalence
 
-    def _set_prevalence(self, prevalence: float) -> None:
+    @prevalence.setter
+    def prevalence(self, prevalence: float) -> None:
         self._prevalence = prevalence
 
-    prevalence = property(_get_prevalence, _set_prevalence)
-
-    def _get_heritability(self) -> float:
+    @property
+    def heritability(self) -> float:
         return self._heritability
 
-    def _set_heritability(self, heritability: float) -> None:
+    @heritability.setter
+    def heritability(self, heritability: float) -> None:
         self._heritability = heritability
 
-    heritability = property(_get_heritability, _set_heritability)
-
     @property
     def order(self) -> int:
         return self._order
 
     @property
     def genotypes(self) -> List[str]:
-        return self._genotypes
+        return self._genotypes.tolist()
 
     @property
-    def genotypes_as_numpy(self) -> numpy.array:
-        return numpy.array(self._genotypes)
+    def genotypes_as_numpy(self) -> numpy.ndarray:
+        return self._genotypes
 
     @property
     def penetrance_values(self) -> List[float]:
-        return self._penetrance_values
+        return self._penetrance_values.tolist()
 
     @property
-    def penetrance_values_as_numpy(self) -> numpy.array:
-        return numpy.array(self._penetrance_values)
+    def penetrance_values_as_numpy(self) -> numpy.ndarray:
+        return self._penetrance_values
 
     ########################################
 
     def __hash__(self):
         return hash(
-            hash(self._order)
-            + hash(str(self._genotypes))
-            + hash(str(self._penetrance_values))
-            + hash(self._values)
-            + hash(self._model_name)
-            + hash(self._mafs)
-            + hash(self._prevalence)
-            + hash(self._heritability)
+            (
+                self._order,
+                self._model_name,
+                self._penetrance_values.tobytes(),  # One bytes view
+                tuple(self._mafs or ()),
+                tuple(self._values),
+            )
         )
 
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        """Compare the fields of the tables, not their hashes, which may
+        collide. The hash leaves out the prevalence and the heritability,
+        because they are calculated when the table is saved as GAMETES."""
+        if not isinstance(other, PTable):
+            return NotImplemented
+        return (
+            self._order == other._order
+            and self._model_name == other._model_name
+            and numpy.array_equal(self._penetrance_values, other._penetrance_values)
+            and self._mafs == other._mafs
+            and self._values == other._values
+            and self._prevalence == other._prevalence
+            and self._heritability == other._heritability
+        )
 
-    def _compound_table_as_text(self) -> str:
-        """Compound the penetrance table as text, to print it ot save into a
-        file it.
+    def _write_table_as_csv(self, f: TextIO) -> None:
+        """Write the penetrance table as CSV into an open text stream, to
+        print it or save it into a file. Rows are written directly,
+        without composing the whole table as a string before. Penetrances
+        are written with 15 significant digits.
 
-        Returns
-        -------
-        str
-            The penetrance table formatted as a text string.
+        Parameters
+        ----------
+        f : TextIO
+            The open text stream where to write the table.
         """
-        # Generate lines of the file with genotypes and its penetrances
-        lines = ""
-        for genotype, penetrance in zip(self._genotypes, self._penetrance_values):
-            lines += f"{''.join(genotype)},{penetrance}\n"
-
-        return lines
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerows(
+            (genotype, _format_penetrance(penetrance))
+            for genotype, penetrance in zip(self._genotypes, self._penetrance_values)
+        )
 
     def _compound_table_as_gametes(self) -> str:
         """Compound the penetrance table as GAMETES format, to save it into a
@@ -175,19 +297,24 @@ class PTable:
         GenericCalculationError
             Failing to calculate prevalence or heritability to save as GAMETES.
         """
-        """Calculate prevalence and heritability. Do here to optimize,
-            because they are only needed to save as GAMETES format"""
+        # Penetrances with 15 significant digits, as the CSV format
+        penetrances = [_format_penetrance(p) for p in self._penetrance_values]
+        written_penetrances = [float(p) for p in penetrances]
+
+        """Calculate prevalence and heritability, except the one fixed to
+            generate the table. Do here to optimize, because they are only
+            needed to save as GAMETES format. The penetrance values are
+            already numeric, so the numeric variants are used, with the
+            values as written in the table"""
         try:
-            self._prevalence = pytoxo.calculations.compute_prevalence(
-                penetrances=self._penetrance_values,
-                mafs=self._mafs,
-                model_order=self._order,
-            )
-            self._heritability = pytoxo.calculations.compute_heritability(
-                penetrances=self._penetrance_values,
-                mafs=self._mafs,
-                model_order=self._order,
-            )
+            if self._prevalence is None:
+                self._prevalence = pytoxo.calculations.compute_numeric_prevalence(
+                    penetrances=written_penetrances, mafs=self._mafs
+                )
+            if self._heritability is None:
+                self._heritability = pytoxo.calculations.compute_numeric_heritability(
+                    penetrances=written_penetrances, mafs=self._mafs
+                )
         except pytoxo.errors.GenericCalculationError as e:
             raise pytoxo.errors.GenericCalculationError(
                 "It is no possible to calculate the "
@@ -202,26 +329,28 @@ class PTable:
         )
 
         # Prepare fields to fill
-        attribute_names = "\t".join([f"P{i}" for i in range(0, self.order)])
-        mafs = "\t".join([f"{'{:.3f}'.format(maf)}" for maf in self._mafs])
+        attribute_names = _gametes_attribute_names(self._order)
+        mafs = "\t".join(f"{maf:.3f}" for maf in self._mafs)
         x = str(self._values[0])
         y = str(self._values[1])
-        prev = str(self._prevalence.evalf())
-        her = str(self._heritability.evalf())
+        prev = str(
+            sympy.Float(self._prevalence, 15)
+        )  # Same precision as `x` and `y`, which are Sympy numbers
+        her = str(sympy.Float(self._heritability, 15))
 
         # Prepare table to fill
         table = ""
-        for i in range(0, len(self._penetrance_values), 9):
+        for i in range(0, len(penetrances), 9):
             table += (
-                f"{self._penetrance_values[i]}, "
-                f"{self._penetrance_values[i+1]}, "
-                f"{self._penetrance_values[i+2]}\n"
-                f"{self._penetrance_values[i+3]}, "
-                f"{self._penetrance_values[i+4]}, "
-                f"{self._penetrance_values[i+5]}\n"
-                f"{self._penetrance_values[i+6]}, "
-                f"{self._penetrance_values[i+7]}, "
-                f"{self._penetrance_values[i+8]}\n\n"
+                f"{penetrances[i]}, "
+                f"{penetrances[i+1]}, "
+                f"{penetrances[i+2]}\n"
+                f"{penetrances[i+3]}, "
+                f"{penetrances[i+4]}, "
+                f"{penetrances[i+5]}\n"
+                f"{penetrances[i+6]}, "
+                f"{penetrances[i+7]}, "
+                f"{penetrances[i+8]}\n\n"
             )
         table = table[:-1]
 
@@ -261,13 +390,12 @@ class PTable:
                 f"The '{format}' format requires to be filled the attribute `mafs`."
             )
 
-        # Generate the table
+        # Generate and print the table
         if format == "csv":
-            table = self._compound_table_as_text()
+            self._write_table_as_csv(sys.stdout)
+            print()  # Keep the blank line after the table of the printed output
         else:
-            table = self._compound_table_as_gametes()
-
-        print(table)
+            print(self._compound_table_as_gametes())
 
     def write_to_file(
         self, filename: str, overwrite: bool = False, format: str = "gametes"
@@ -316,20 +444,23 @@ class PTable:
 
         # Calculate final filename
         filename = os.path.normpath(filename)
-        # Check final file name
-        if os.path.exists(filename) and not overwrite:
+        # Check final file name, with only one `stat` call
+        try:
+            file_stat = os.stat(filename)
+        except FileNotFoundError:
+            file_stat = None
+        if file_stat is not None and not overwrite:
             raise FileExistsError(filename)
-        if os.path.exists(filename) and not os.path.isfile(filename):
+        if file_stat is not None and not stat.S_ISREG(file_stat.st_mode):
             raise IsADirectoryError(filename)
 
-        # Generate the table
+        # Generate the table before touching the file, in case it fails
         if format == "gametes":
             table = self._compound_table_as_gametes()
-        else:
-            table = self._compound_table_as_text()
 
-        # Write file
-        if overwrite and os.path.exists(filename):
-            os.remove(filename)
-        with open(filename, "x") as f:
-            f.write(table)
+        # Write file. Mode "w" truncates the file if it exists and it is allowed
+        with open(filename, "w" if overwrite else "x") as f:
+            if format == "gametes":
+                f.write(table)
+            else:
+                self._write_table_as_csv(f)
@@ -19,9 +19,6 @@ import sys
 import colorama
 import termcolor
 
-import pytoxo
-import pytoxo.errors
-
 # Necessary to use colors in Windows machines
 colorama.init()
 
@@ -43,7 +40,6 @@ def main():
         "model",
         metavar="MODEL",
         type=str,
-        nargs=1,
         help="The path to the epistatic model CSV file.",
     )
     parser.add_argument(
@@ -69,7 +65,6 @@ def main():
         "prev_or_her_arg",
         metavar="PREV_OR_HER",
         type=float,
-        nargs=1,
         help="The heritability or prevalence to fix, depending of the used "
         "flag. Maximizing prevalence, this argument will be interpreted "
         "as heritability; and maximizing heritability, as prevalence.",
@@ -89,14 +84,19 @@ def main():
         print(f"{error_hd} Argument parsing error.")
         sys.exit(1)
 
+    """Import PyToxo only here, after parsing, because it loads Sympy and
+    Numpy, which are not needed for the help or argument errors"""
+    import pytoxo
+    import pytoxo.errors
+
     # Get arguments
-    model = args.model[0]
+    model = args.model
     mafs = args.mafs
     if args.max_prev:
         calc_target = pytoxo.Model.find_max_prevalence_table
     else:
         calc_target = pytoxo.Model.find_max_heritability_table
-    prev_or_her = args.prev_or_her_arg[0]
+    prev_or_her = args.prev_or_her_arg
     if args.gametes:
         output_format = "gametes"
     else:
@@ -14,40 +14,128 @@
 """Graphical user interface entry point."""
 
 import base64
+import functools
+import hashlib
 import io
+import itertools
 import os
-import platform
-import subprocess
-from typing import List
-
-import PIL.Image
-
-import pytoxo
-import pytoxo.errors
-
-# Detect the platform where the GUI is going to be used
-detected_platform = platform.system()
+import re
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    import pytoxo
+
+# Detect the platform where the GUI is going to be used, named as
+# `platform.system()` does, without importing that module
+detected_platform = {"darwin": "Darwin", "linux": "Linux", "win32": "Windows"}.get(
+    sys.platform, sys.platform
+)
 
 """PySimpleGUI imports Tk, and this fail if Tk is not correctly installed in 
 the platform"""
 try:
     import PySimpleGUI as sg
 except ImportError:
+    import pytoxo.errors
+
     print(pytoxo.errors.GUIUnsupportedPlatformError(detected_platform).message)
     exit(1)
 
 MAX_ORDER_SUPPORTED = 12  # The interface would need some fixes to support bigger orders
 MAX_NUMERICAL_INPUT_LEN = 20
+NUMERICAL_INPUT_REGEX = re.compile(r"\d*\.?\d*")  # Digits and only one `.`
+DIGITS = frozenset("0123456789")
 INFO_BANNER_MAX_MODEL_NAME_LEN = 18
+VALIDATION_DELAY = 0.3  # Seconds without typing in an entry to validate it
+MODEL_TABLE_FIRST_ROWS = 500  # Printed at first. The rest, while scrolling
+OPENED_MODELS_CACHED = 4  # Last opened models kept to open them again
+CALCULATION_THREAD_NAME = "PyToxoCalculation"
+MAFS_INPUT_KEYS = [f"-MAFS_INPUT_{i}-" for i in range(1, MAX_ORDER_SUPPORTED + 1)]
+
+
+def is_numerical_input(text: str) -> bool:
+    """Check if a text is a valid value for the numerical entries: only
+    digits and one `.`, and not too long. Empty is also valid."""
+    return (
+        len(text) <= MAX_NUMERICAL_INPUT_LEN
+        and NUMERICAL_INPUT_REGEX.fullmatch(text) is not None
+    )
+
+
+def validate_numerical_input_edit(action: str, text: str, edited: str) -> bool:
+    """Tk validation command of the numerical entries, which receives the
+    action code (`1` insertion, `0` deletion), the text if the edit is
+    allowed and the inserted or deleted text. The entries always hold a
+    valid value, so deleting from them or typing a digit only can make the
+    text too long, which saves the regular expression in the most common
+    keystrokes."""
+    if action == "0":
+        return True
+    if edited in DIGITS:
+        return len(text) <= MAX_NUMERICAL_INPUT_LEN
+    return is_numerical_input(text)
+
+
+def parse_numerical_input(text: str) -> Optional[float]:
+    """Parse the value of a numerical entry, or return `None` if it is
+    still incomplete, i.e. empty or `.`. Tk only allows valid numerical
+    inputs in the entries, so any other value is parsable."""
+    if text == "" or text == ".":
+        return None
+    return float(text)
+
+
+# Last value of each numerical entry after beautifying it
+beautified_values = {}
+
+
+def beautify_numerical_input(entry: sg.Input) -> str:
+    """Beautify an incomplete numerical entry, e.g. `.2` as `0.2`, and
+    return its final value. The value is kept as is if its beautified
+    version is not a valid numerical input, e.g. `1e-05`, which could not
+    be edited after because Tk rejects any change on it."""
+    value = entry.get()
+    if beautified_values.get(entry.Key) == value:
+        return value  # Not changed since the last time
+    number = parse_numerical_input(value)
+    if number is None:
+        if value != ".":
+            return value  # Empty
+        number = 0.0  # Fix `.`
+    beautified = str(number)  # Fix e.g. `00.1`, `0.4600000` or `1.`
+    if beautified != value and is_numerical_input(beautified):
+        entry.update(value=beautified)
+        value = beautified
+    beautified_values[entry.Key] = value
+    return value
 
 
 class PyToxoContext:
     """Support container class to maintain the PyToxo stuff state during GUI
     main loop."""
 
-    model = None  # Loaded PyToxo model
-    order = 1  # Must be modified when a model is loaded. Before serves to control some workarounds with the GUI
-    ptable = None  # When a penetrance table is calculated
+    def __init__(self):
+        self.clean()
+
+    def clean(self) -> None:
+        """Set the state without a loaded model."""
+        self.model = None  # Loaded PyToxo model
+        self.order = 1  # Must be modified when a model is loaded. Before serves to control some workarounds with the GUI
+        self.ptable = None  # When a penetrance table is calculated
+        self.genotypes = None  # Genotypes column of the GUI's table
+        self.penetrances = None  # Penetrances column of the GUI's table
+        self.valid_inputs = set()  # Valid values against the model, as (is MAF, text)
+        self.pending_validations = {}  # Time of the last change of each entry
+        self.mafs_probe = []  # Valid MAFs to validate the entries, set with the model
+        self.mafs_keys = []  # MAFs entries in use, set when a model is loaded
+        self.text_keys = ["-PREV_OR_HER_INPUT-"]  # Numerical entries in use
+        self.text_keys_set = frozenset(self.text_keys)  # To check the events
+        self.text_elements = {}  # Numerical entries in use by key, set with the model
+        self.empty_keys = set(self.text_keys)  # Numerical entries still empty
+        self.calculation = None  # Thread calculating a penetrance table
 
 
 # ####################### GUI DESIGN ######################
@@ -65,11 +153,24 @@ if detected_platform == "Darwin":  # Mac OS
     """With Mac OS the menu is located in the upper menu bar, and it is 
     sensitive to the theme that is being used in the system, so it is consulted
     below"""
-    p = subprocess.Popen(
-        "defaults read -g AppleInterfaceStyle", shell=True, stdout=subprocess.PIPE
-    )
-    output, _ = p.communicate()
-    macos_current_theme = output.decode("UTF-8").strip()
+    try:
+        from Foundation import NSUserDefaults  # With PyObjC, if installed
+
+        macos_current_theme = NSUserDefaults.standardUserDefaults().stringForKey_(
+            "AppleInterfaceStyle"
+        )
+    except ImportError:
+        import subprocess  # Only needed here
+
+        try:
+            output = subprocess.run(
+                ["defaults", "read", "-g", "AppleInterfaceStyle"],
+                capture_output=True,
+                timeout=2,
+            ).stdout
+            macos_current_theme = output.decode("UTF-8").strip()
+        except (OSError, subprocess.SubprocessError):
+            macos_current_theme = None  # As the default light theme
     if macos_current_theme == "Dark":
         menu_text_color_dep_of_platform = "#ffffff"
     else:
@@ -93,6 +194,8 @@ elif detected_platform == "Windows":
     hide_windows_to_emulate_modal_dep_of_platform = False
     menu_text_color_dep_of_platform = "#000000"
 else:
+    import pytoxo.errors
+
     raise pytoxo.errors.GUIUnsupportedPlatformError(detected_platform)
 
 # Main style settings
@@ -151,6 +254,9 @@ table_headers_font = window_general_font
 state_ready_font = ("", state_ready_font_size_dep_of_platform, "bold")
 state_calculating_font = ("", state_calculating_font_size_dep_of_platform, "bold")
 
+# Popups with the general style
+popup_ok = functools.partial(sg.popup_ok, modal=True, font=window_general_font)
+
 # Other style settings: font colors
 table_font_color = "#000000"
 table_headers_font_color = "#ffffff"
@@ -190,36 +296,103 @@ menu = sg.Menu(
     text_color=menu_text_color_dep_of_platform,
 )
 
-# Logo preparation for the main window
-logo = PIL.Image.open(io.BytesIO(base64.b64decode(logo_pytoxo_dep_of_style)))
-logo_size_x, logo_size_y = logo.size
-logo_new_size_x = 450
-logo_new_size = (logo_new_size_x, (logo_size_y * logo_new_size_x) // logo_size_x)
-logo = logo.resize(logo_new_size, PIL.Image.ANTIALIAS)
-buffered = io.BytesIO()
-logo.save(buffered, format="GIF")  # GIF is the best format for Tkinter
-logo_b64 = base64.b64encode(buffered.getvalue())
-
-# Logo preparation for the about pop-up
-logo_popup_size_x = 300
-logo_popup_size = (logo_popup_size_x, (logo_size_y * logo_popup_size_x) // logo_size_x)
-logo = logo.resize(logo_popup_size, PIL.Image.ANTIALIAS)
-buffered = io.BytesIO()
-logo.save(buffered, format="GIF")  # GIF is the best format for Tkinter
-logo_b64_popup = base64.b64encode(buffered.getvalue())
+# Resized logos, to not resize them again each time the GUI is opened. In
+# the user cache directory of each platform
+if detected_platform == "Darwin":
+    user_cache_dir_dep_of_platform = os.path.join(
+        os.path.expanduser("~"), "Library", "Caches"
+    )
+elif detected_platform == "Windows":
+    user_cache_dir_dep_of_platform = os.environ.get(
+        "LOCALAPPDATA", os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    )
+else:
+    user_cache_dir_dep_of_platform = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+LOGOS_CACHE_DIR = os.path.join(user_cache_dir_dep_of_platform, "pytoxo", "logos")
+
+
+def is_complete_gif(gif: bytes, size_x: int) -> bool:
+    """Check that some bytes are a whole GIF of a width, walking all its
+    blocks until the trailer, so a truncated or corrupted cached logo is not
+    given to Tk. The image data is not decompressed, so PIL is not needed."""
+    if gif[:6] not in (b"GIF87a", b"GIF89a") or len(gif) < 13:
+        return False
+    if int.from_bytes(gif[6:8], "little") != size_x:
+        return False
+    i = 13
+    if gif[10] & 0x80:  # Global color table
+        i += 3 * 2 ** ((gif[10] & 0x07) + 1)
+    try:
+        while gif[i] != 0x3B:  # Trailer
+            if gif[i] == 0x21:  # Extension: label and data sub-blocks
+                i += 2
+            elif gif[i] == 0x2C:  # Image: descriptor, color table and data
+                if gif[i + 9] & 0x80:  # Local color table
+                    i += 3 * 2 ** ((gif[i + 9] & 0x07) + 1)
+                i += 11  # Also the LZW minimum code size
+            else:
+                return False
+            while gif[i]:  # Data sub-blocks, until an empty one
+                i += gif[i] + 1
+            i += 1
+    except IndexError:
+        return False  # Truncated
+    return i == len(gif) - 1
+
+
+def prepare_logo(logo_b64: str, new_size_x: int) -> bytes:
+    """Resize a logo, given as a base64 GIF, to a width keeping its aspect
+    ratio, and return it as a base64 GIF, the best format for Tkinter. The
+    resized logos are cached in `LOGOS_CACHE_DIR`, so PIL is only needed
+    the first time."""
+    digest = hashlib.sha1(logo_b64.encode()).hexdigest()
+    cache_filename = os.path.join(LOGOS_CACHE_DIR, f"{digest}_{new_size_x}.gif")
+    try:
+        with open(cache_filename, "rb") as f:
+            gif = f.read()
+        if is_complete_gif(gif, new_size_x):
+            return base64.b64encode(gif)
+    except OSError:
+        pass  # Not cached yet
+    # Else, cached but broken, so it is rewritten
+
+    import PIL.Image
+
+    logo = PIL.Image.open(io.BytesIO(base64.b64decode(logo_b64)))
+    size_x, size_y = logo.size
+    new_size = (new_size_x, (size_y * new_size_x) // size_x)
+    logo = logo.resize(new_size, PIL.Image.LANCZOS)
+    buffered = io.BytesIO()
+    logo.save(buffered, format="GIF")
+    gif = buffered.getvalue()
+    """Written to a temporary file which replaces the cached one at once, so
+    an interrupted write or another GUI starting meanwhile never leave a
+    truncated logo in the cache"""
+    try:
+        import tempfile  # Only needed here
+
+        os.makedirs(LOGOS_CACHE_DIR, exist_ok=True)
+        fd, temp_filename = tempfile.mkstemp(dir=LOGOS_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gif)
+            os.replace(temp_filename, cache_filename)
+        except OSError:
+            os.remove(temp_filename)
+            raise
+    except OSError:
+        pass  # Simply not cached, e.g. a read-only home
+    return base64.b64encode(gif)
+
+
+# Logo preparation for the main window and the about pop-up
+logo_b64 = prepare_logo(logo_pytoxo_dep_of_style, 450)
+logo_b64_popup = prepare_logo(logo_pytoxo_dep_of_style, 300)
 
 # UDC's logo preparation for the about pop-up
-logo_udc = PIL.Image.open(io.BytesIO(base64.b64decode(logo_udc_dep_of_style)))
-logo_udc_size_x, logo_udc_size_y = logo_udc.size
-logo_udc_new_size_x = 300
-logo_udc_new_size = (
-    logo_udc_new_size_x,
-    (logo_udc_size_y * logo_udc_new_size_x) // logo_udc_size_x,
-)
-logo_udc = logo_udc.resize(logo_udc_new_size, PIL.Image.ANTIALIAS)
-buffered = io.BytesIO()
-logo_udc.save(buffered, format="GIF")  # GIF is the best format for Tkinter
-logo_udc_b64 = base64.b64encode(buffered.getvalue())
+logo_udc_b64 = prepare_logo(logo_udc_dep_of_style, 300)
 
 # Epistatic model table
 headings = [
@@ -270,6 +443,10 @@ info_banner_fixing_maximizing_options = ["prevalence", "heritability"]
 info_banner_model_none_text = f"{info_banner_model_skeleton_text.format('none','none')}"
 info_banner_fixing_none_text = f"{info_banner_fixing_head_text}none"
 info_banner_maximizing_none_text = f"{info_banner_maximizing_head_text}none"
+info_banner_head_texts = {
+    "-INFO_FIXING-": info_banner_fixing_head_text,
+    "-INFO_MAXIMIZING-": info_banner_maximizing_head_text,
+}
 info_banner = [
     [
         sg.Text(
@@ -341,21 +518,12 @@ prev_or_her_frame = sg.Frame(
 )
 
 # MAFs frame text entries
-mafs_entries = []
-for i in range(1, MAX_ORDER_SUPPORTED + 1):
-    mafs_entries.append(
-        sg.pin(  # To fix the entries in the layout, in horizontal
-            sg.InputText(
-                key=f"-MAFS_INPUT_{i}-",
-                visible=False,  # Pending to be enabled when a model was loaded
-                enable_events=True,  # To refresh the loop and can check filled fields
-                tooltip=tt_mafs_input,
-                size=(4, 1),
-                pad=(1, 3),  # 3 seems to be the default
-                text_color=text_inputs_text_color,
-            )
-        )
-    )
+"""The entries are created when a model needs them, in these slots to fix 
+them in the layout, in horizontal"""
+mafs_entries_slots = [
+    sg.Column([[]], key=f"-MAFS_SLOT_{i}-", pad=(0, 0))
+    for i in range(1, MAX_ORDER_SUPPORTED + 1)
+]
 
 # MAFs frame
 mafs_frame = sg.Frame(
@@ -371,7 +539,7 @@ mafs_frame = sg.Frame(
                 text_color=disabled_text_color,
             ),
         ]
-        + mafs_entries
+        + mafs_entries_slots
     ],
     element_justification="center",
 )
@@ -416,50 +584,242 @@ window = sg.Window(
     element_justification="center",
 )
 
+"""Only numerical values are allowed in the numerical entries. Tk rejects
+the illegal keystrokes by itself, so the user perceives that they are
+ignored, without any round-trip through the main loop"""
+numerical_input_validate_command = (
+    window.TKroot.register(validate_numerical_input_edit),
+    "%d",
+    "%P",
+    "%S",
+)
+
+
+def set_up_numerical_input(entry: sg.Input) -> None:
+    """Set up the validation and the beautifying of a numerical entry."""
+    entry.Widget.configure(
+        validate="key", validatecommand=numerical_input_validate_command
+    )
+    # Beautify the entry when the user leaves it, directly from Tk
+    entry.Widget.bind("<FocusOut>", lambda _: beautify_numerical_input(entry), add="+")
+
+
+set_up_numerical_input(window["-PREV_OR_HER_INPUT-"])
+
+# Print the pending rows of the model table when the user scrolls to its end
+model_table = window["-MODEL_TABLE-"]
+model_table_yscrollcommand = model_table.Widget.cget("yscrollcommand")
+
+
+def on_model_table_scroll(first: str, last: str) -> None:
+    """Tk scroll command of the model table, which receives the visible
+    fraction of the table."""
+    if model_table_yscrollcommand:  # Keep the previous one, if any
+        window.TKroot.tk.eval(f"{model_table_yscrollcommand} {first} {last}")
+    if float(last) >= 1.0:
+        window.TKroot.after_idle(print_model_table_pending_rows, window)
+
+
+model_table.Widget.configure(yscrollcommand=on_model_table_scroll)
+
 
 # #########################################################
 
 
 # ################## AUXILIARY FUNCTIONS ##################
-def refresh_mafs_entries_to_check_keys(pytoxo_context: PyToxoContext) -> List[str]:
-    """Auxiliary function to refresh contents used in several times within
-    the GUI main loop."""
-    return [f"-MAFS_INPUT_" f"{i}-" for i in range(1, pytoxo_context.order + 1)]
+# Last state set to each element through `update_element`
+elements_last_state = {}
+# Elements updated through `update_element`, to look up each one only once
+elements_by_key = {}
+
+
+def update_element(
+    window: sg.Window, key: str, read_values: Optional[dict] = None, **state
+) -> None:
+    """Auxiliary function to update an element of the window only with the
+    attributes which have changed since the last time they were set with
+    this function, saving the useless round-trips to Tk. The tooltip is
+    supported as a `tooltip` attribute. The user can modify the `value`
+    of the input elements, so it is compared with the values read in the
+    current loop iteration, which must be passed as `read_values`, and
+    which are also updated."""
+    last_state = elements_last_state.setdefault(key, {})
+    new_value = state.pop("value") if read_values is not None else None
+    changes = {
+        attribute: value
+        for attribute, value in state.items()
+        if attribute not in last_state or last_state[attribute] != value
+    }
+    last_state.update(changes)
+    if read_values is not None and read_values[key] != new_value:
+        read_values[key] = new_value
+        changes["value"] = new_value
+    if changes:
+        element = elements_by_key.get(key)
+        if element is None:
+            element = elements_by_key[key] = window[key]
+        if "tooltip" in changes:
+            element.set_tooltip(changes.pop("tooltip"))
+        if changes:
+            element.Update(**changes)
+
+
+# Rows of the model table which are still not printed
+model_table_pending_rows = {"rows": iter(())}
+
+
+def update_model_table(window: sg.Window, rows: Iterable[list]) -> None:
+    """Auxiliary function to print rows in the model table. Only the first
+    rows are printed at first, and the following ones while the user
+    scrolls to the end of the table, so the large models do not need to
+    create all their Tk items. The rows are taken from the iterable as they
+    are needed."""
+    rows = iter(rows)
+    model_table_pending_rows["rows"] = rows
+    update_element(
+        window,
+        "-MODEL_TABLE-",
+        values=list(itertools.islice(rows, MODEL_TABLE_FIRST_ROWS)),
+    )
+
+
+def print_model_table_pending_rows(window: sg.Window) -> None:
+    """Auxiliary function to print as many pending rows of the model table
+    as already printed ones, if the end of the table is visible. Doubling
+    the printed rows keeps linear the cost to reach the end of the table,
+    although each update prints all the rows again."""
+    first, last = model_table.Widget.yview()
+    if last < 1.0:
+        return  # Already printed by a previous call
+    printed_rows = model_table.Values
+    rows = list(itertools.islice(model_table_pending_rows["rows"], len(printed_rows)))
+    if rows:
+        update_element(window, "-MODEL_TABLE-", values=printed_rows + rows)
+        # Keep the scroll position, which is relative to the printed rows
+        model_table.Widget.yview_moveto(
+            first * len(printed_rows) / (len(printed_rows) + len(rows))
+        )
+
+
+def penetrances_as_text(penetrances: Iterable) -> List[str]:
+    """Auxiliary function to convert the penetrances of a model to the text
+    printed in the model table, so the expressions are not converted again
+    each time the table is printed. Models repeat a few expressions many
+    times, so each distinct one is only converted once."""
+    texts = {}
+    for p in penetrances:
+        if p not in texts:
+            texts[p] = str(p)
+    return [texts[p] for p in penetrances]
+
+
+def create_mafs_entries(window: sg.Window, order: int) -> List[str]:
+    """Auxiliary function to create the MAFs entries needed by a model of
+    the given order which do not exist yet, returning their keys. The
+    elements of a window cannot be removed, so the created entries are
+    kept hidden while a model does not need them."""
+    created_keys = []
+    for i, k in enumerate(MAFS_INPUT_KEYS[:order], start=1):
+        if k in window.AllKeysDict:
+            continue
+        window.extend_layout(
+            window[f"-MAFS_SLOT_{i}-"],
+            [
+                [
+                    sg.pin(
+                        sg.InputText(
+                            key=k,
+                            enable_events=True,  # To refresh the loop and can check filled fields
+                            tooltip=tt_mafs_input,
+                            size=(4, 1),
+                            pad=(1, 3),  # 3 seems to be the default
+                            text_color=text_inputs_text_color,
+                        )
+                    )
+                ]
+            ],
+        )
+        set_up_numerical_input(window[k])
+        elements_last_state[k] = {"visible": True}  # Created visible
+        created_keys.append(k)
+    return created_keys
+
 
+def format_revise_field_message(e: Exception) -> str:
+    """Auxiliary function to format the message of an error caused by a
+    field of the GUI, to show it to the user."""
+    msg = str(e)
+    if not msg.endswith("."):
+        msg += "."
+    return f"{msg} Revise this field."
 
-def refresh_text_entries_to_check_keys(
-    mafs_entries_to_check_keys: List[str],
-) -> List[str]:
-    """Auxiliary function to refresh contents used in several times within
-    the GUI main loop."""
-    return ["-PREV_OR_HER_INPUT-"] + mafs_entries_to_check_keys
 
+def validate_numerical_input(
+    window: sg.Window, pytoxo_context: PyToxoContext, values: dict, key: str
+) -> bool:
+    """Auxiliary function to check that the value of a numerical entry is
+    valid using 'Model' check function, removing it if not. Returns if the
+    value has been kept. The incomplete values are ignored, because the
+    user is still writing, and the already validated ones too."""
+    value = parse_numerical_input(values[key])
+    # All the MAFs entries are validated the same way
+    validated_input = (key != "-PREV_OR_HER_INPUT-", values[key])
+    if value is None or validated_input in pytoxo_context.valid_inputs:
+        return True
+    mafs = pytoxo_context.mafs_probe  # Simply valid values to validate the other
+    try:
+        if key == "-PREV_OR_HER_INPUT-":
+            pytoxo_context.model.check_find_table_parameters(mafs=mafs, h_or_p=value)
+        else:
+            mafs[0] = value  # Validate it in the place of a valid one
+            pytoxo_context.model.check_find_table_parameters(
+                mafs=mafs,
+                h_or_p=0.0,  # Simply a valid value to validate th other ignoring this
+            )
+        pytoxo_context.valid_inputs.add(validated_input)
+        return True
+    except ValueError as e:
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.Hide()
+        popup_ok(
+            format_revise_field_message(e),
+            title="Input configuration validation error",
+        )
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.UnHide()
 
-def refresh_text_entries_to_check_values(
-    text_entries_to_check_keys: List[str], values: dict
-) -> List[str]:
-    """Auxiliary function to refresh contents used in several times within
-    the GUI main loop."""
-    return [values[k] for k in text_entries_to_check_keys]
+        # Remove value, also for the final filled check
+        update_element(window, key, read_values=values, value="")
+        pytoxo_context.empty_keys.add(key)
+        return False
+    finally:
+        mafs[0] = 0.0  # Restore the valid MAFs
 
 
 def check_all_filled(
-    window: sg.Window, values: dict, text_entries_to_check_values: List[str]
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext
 ) -> bool:
     """Check current values state: if all configuration is filled, enable
     calculate button, else disable it. Also returns a bool about the all
     filled condition to add the possibility to reuse this function to a
-    security check before try to calculate."""
+    security check before try to calculate. Without a loaded model, nothing
+    is checked, and neither while a table is being calculated. The numerical
+    entries are not scanned, but their empty ones are tracked in the PyToxo
+    context."""
     if (
-        window["-MODEL_TABLE-"].visible
-        and "" not in [values["-PREV_OR_HER_CB-"]] + text_entries_to_check_values
+        pytoxo_context.model is not None
+        and pytoxo_context.calculation is None
+        and values["-PREV_OR_HER_CB-"] != ""
+        and not pytoxo_context.empty_keys
     ):
-        window["Calculate table"].Update(disabled=False)
-        window["Calculate table"].set_tooltip(tt_calculate_button_en)
+        update_element(
+            window, "Calculate table", disabled=False, tooltip=tt_calculate_button_en
+        )
         return True
     else:
-        window["Calculate table"].Update(disabled=True)
-        window["Calculate table"].set_tooltip(tt_calculate_button_dis)
+        update_element(
+            window, "Calculate table", disabled=True, tooltip=tt_calculate_button_dis
+        )
         return False
 
 
@@ -469,27 +829,28 @@ def update_info_banner(window: sg.Window, key: str, *args: str) -> None:
     `-INFO_FIXING-`, `-INFO_MAXIMIZING-`, `-INFO_STATE_READY-`,
     `-INFO_STATE_CALCULATING-` and `CLEAN`. `CLEAN` key serves to clean the
     banner as default."""
-    if key == "-INFO_MODEL-":
+    head_text = info_banner_head_texts.get(key)
+    if head_text is not None:
+        update_element(window, key, value=f"{head_text}{args[0]}")
+    elif key == "-INFO_MODEL-":
         if len(args[0]) > INFO_BANNER_MAX_MODEL_NAME_LEN:
             name = f"{args[0][:INFO_BANNER_MAX_MODEL_NAME_LEN-3]}..."
         else:
             name = args[0]
-        window[key].Update(
-            value=f"{info_banner_model_skeleton_text.format(name,args[1])}"
+        update_element(
+            window,
+            key,
+            value=f"{info_banner_model_skeleton_text.format(name,args[1])}",
         )
-    elif key == "-INFO_FIXING-":
-        window[key].Update(value=f"{info_banner_fixing_head_text}{args[0]}")
-    elif key == "-INFO_MAXIMIZING-":
-        window[key].Update(value=f"{info_banner_maximizing_head_text}{args[0]}")
     elif key == "-INFO_STATE_READY-":
-        window[key].Update(visible=True)
-        window["-INFO_STATE_CALCULATING-"].Update(visible=False)
+        update_element(window, key, visible=True)
+        update_element(window, "-INFO_STATE_CALCULATING-", visible=False)
     elif key == "-INFO_STATE_CALCULATING-":
-        window[key].Update(visible=True)
-        window["-INFO_STATE_READY-"].Update(visible=False)
+        update_element(window, key, visible=True)
+        update_element(window, "-INFO_STATE_READY-", visible=False)
         window.refresh()  # Needed here because it does not go through the loop
     elif key == "CLEAN":
-        window["-INFO_MODEL-"].Update(value=f"{info_banner_model_none_text}")
+        update_element(window, "-INFO_MODEL-", value=f"{info_banner_model_none_text}")
         window.refresh()  # Needed here because it does not go through the loop
     else:
         raise ValueError(key)
@@ -498,469 +859,548 @@ def update_info_banner(window: sg.Window, key: str, *args: str) -> None:
 # #########################################################
 
 
-# ##################### GUI EVENT LOOP ####################
-def main():
-    # Create PyToxo context object
-    pytoxo_context = PyToxoContext()
-
-    while True:
-        event, values = window.read()
-
-        # Check if exit event
-        if event in ("Exit", sg.WIN_CLOSED, None):
-            break
-
-        # Load text items to check
-        mafs_entries_to_check_keys = refresh_mafs_entries_to_check_keys(pytoxo_context)
-        text_entries_to_check_keys = refresh_text_entries_to_check_keys(
-            mafs_entries_to_check_keys
+# ################### GUI EVENT HANDLERS ##################
+# Last opened models by file name, with the modification time and the size
+# of the file, from the least to the most recently opened
+opened_models = {}
+
+
+def handle_open_model(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Load a model from a file selected by the user and prepare the GUI to
+    use it."""
+    import pytoxo  # Only when needed, since it loads SymPy
+    import pytoxo.errors
+
+    # Parsing a model is SymPy work, see `is_calculating`
+    if is_calculating():
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.Hide()
+        popup_ok(
+            "A penetrance table is still being calculated. Wait for it "
+            "to finish before opening a model.",
+            title="Calculation in progress",
         )
-        text_entries_to_check_values = refresh_text_entries_to_check_values(
-            text_entries_to_check_keys, values
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.UnHide()
+        return
+
+    filename = sg.popup_get_file(
+        "Open model",
+        no_window=True,  # To use a native approach
+        file_types=(("Comma separated values", "*.csv"),),
+        modal=True,  # Work in all platforms (native approach)
+    )
+    if not filename:
+        return  # The operation has been canceled
+    try:
+        """Reuse the model if the file has not changed since it was opened.
+        The size is also compared, since the modification time may be too
+        coarse to notice a quick edit"""
+        st = os.stat(filename)
+        file_state = (st.st_mtime_ns, st.st_size)
+        opened_file_state, model = opened_models.pop(filename, (None, None))
+        if opened_file_state != file_state:
+            model = pytoxo.Model(filename)
+        opened_models[filename] = (file_state, model)  # The most recent
+        if len(opened_models) > OPENED_MODELS_CACHED:
+            del opened_models[next(iter(opened_models))]  # The least recent
+
+        # Load to the PyToxo context
+        pytoxo_context.model = model
+        pytoxo_context.order = (
+            pytoxo_context.model.order
+        )  # It is important to update also this
+        pytoxo_context.ptable = None  # Calculated for other model
+        pytoxo_context.calculation = None  # Calculating for other model
+        pytoxo_context.valid_inputs = set()  # Validated for other model
+        pytoxo_context.mafs_keys = MAFS_INPUT_KEYS[: pytoxo_context.order]
+        pytoxo_context.mafs_probe = [0.0] * pytoxo_context.order
+        pytoxo_context.text_keys = [
+            "-PREV_OR_HER_INPUT-",
+            *pytoxo_context.mafs_keys,
+        ]
+        pytoxo_context.text_keys_set = frozenset(pytoxo_context.text_keys)
+        """Cache the model columns of the GUI's table, to only add the
+        calculated penetrances to them later"""
+        pytoxo_context.genotypes = pytoxo_context.model.genotypes  # Shared
+        pytoxo_context.penetrances = penetrances_as_text(
+            pytoxo_context.model.penetrances
         )
 
-        """Fix the input of illegal chars. In entry widgets, 
-        only numerical values are allowed"""
-        if pytoxo_context.model and values:
-            for k in text_entries_to_check_keys:
-                if len(values[k]) > 1 and (
-                    values[k][-1] not in (".0123456789")  # Illegal chars
-                    or (
-                        "." in values[k][:-1] and values[k][-1] == "."
-                    )  # Only one `.` in the entry
-                    or len(values[k]) > MAX_NUMERICAL_INPUT_LEN  # Already too long
-                ):
-                    """Delete last char from input. The user perceives that
-                    the keystroke is ignored"""
-                    values[k] = values[k][:-1]
-                    window[k].update(value=values[k])
-                elif len(values[k]) == 1 and values[k] not in (
-                    ".0123456789"
-                ):  # Illegal chars
-                    values[k] = ""
-                    window[k].update(value=values[k])
-
-            # Refresh text items to check
-            mafs_entries_to_check_keys = refresh_mafs_entries_to_check_keys(
-                pytoxo_context
-            )
-            text_entries_to_check_keys = refresh_text_entries_to_check_keys(
-                mafs_entries_to_check_keys
-            )
-            text_entries_to_check_values = refresh_text_entries_to_check_values(
-                text_entries_to_check_keys, values
+        # Print model in the GUI's table
+        update_model_table(
+            window,
+            map(list, zip(pytoxo_context.genotypes, pytoxo_context.penetrances)),
+        )
+        """Enable MAFs assuring to prevent from being enabled too 
+        many when changing from a larger model to a smaller one. 
+        Assure also that MAFs are all empty. Tk already relayouts 
+        the window only once, when idle, so only the useless calls 
+        are saved"""
+        for k in create_mafs_entries(window, pytoxo_context.order):
+            values[k] = ""  # Out of the last read
+        for i, k in enumerate(MAFS_INPUT_KEYS, start=1):
+            if k not in values:
+                break  # Not created yet, as the following
+            update_element(
+                window,
+                k,
+                read_values=values,
+                value="",
+                visible=i <= pytoxo_context.order,
             )
+        update_element(window, "-MAFS_DISABLED_TEXT-", visible=False)
+        pytoxo_context.text_elements = {
+            k: window[k] for k in pytoxo_context.text_keys
+        }  # The entries exist now
+        pytoxo_context.empty_keys = {
+            k for k in pytoxo_context.text_keys if values[k] == ""
+        }  # The prevalence or heritability is kept
+
+        # Enable prevalence or heritability entry
+        """Note: actually this parameter is independent of the load 
+        of the model. However, thus limiting the order of filling 
+        fields, it is possible to validate this field with the validator
+        of the model, which otherwise might not be available. It also
+        makes the user better understand the order in which the 
+        interface should be used."""
+        update_element(
+            window,
+            "-PREV_OR_HER_INPUT-",
+            disabled=False,
+            tooltip=tt_prev_or_her_input_en,
+        )
 
-        # Beautify incomplete fields like `.2` instead of `0.2`
-        if pytoxo_context.model and values:
-            for k in text_entries_to_check_keys:
-                if values[k] == "." and event != k:
-                    # Fix `.`
-                    values[k] = "0.0"
-                    window[k].Update(value=values[k])
-                elif values[k] != "" and event != k:
-                    # Fix e.g. `00.1`, `0.4600000`, `1.` or `.23'
-                    values[k] = str(float(values[k]))
-                    window[k].update(value=values[k])
+        # Update informative banner
+        update_info_banner(window, "-INFO_STATE_READY-")  # Discard any calculation
+        update_info_banner(
+            window,
+            "-INFO_MODEL-",
+            pytoxo_context.model.name,
+            str(pytoxo_context.order),
+        )
+    except pytoxo.errors.BadFormedModelError:
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.Hide()
+        popup_ok(
+            "The file contains a bad formed model. PyToxo cannot "
+            "interpret it. Revise PyToxo's file format requirements.",
+            title="File parsing error",
+        )
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.UnHide()
+    except IOError:
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.Hide()
+        popup_ok(
+            f"Error trying to open '{filename}'.",
+            title="File opening error",
+        )
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.UnHide()
+
+
+def handle_close_model(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Close the loaded model and clean the GUI."""
+    # Load to the PyToxo context
+    previous_mafs_keys = pytoxo_context.mafs_keys  # To disable them
+    pytoxo_context.clean()  # Refresh without the model
+
+    # Remove the previous model from the GUI
+    update_model_table(window, empty_rows)
+
+    # Disable MAFs and clean values
+    for k in previous_mafs_keys:
+        update_element(window, k, read_values=values, value="", visible=False)
+    update_element(window, "-MAFS_DISABLED_TEXT-", visible=True)
+
+    # Disable prevalence or heritability entry and clean values
+    """Note: actually this parameter is independent of the load 
+    of the model. However, thus limiting the order of filling 
+    fields, it is possible to validate this field with the validator
+    of the model, which otherwise might not be available. It also
+    makes the user better understand the order in which the 
+    interface should be used."""
+    update_element(window, "-PREV_OR_HER_CB-", read_values=values, value="")
+    update_element(
+        window,
+        "-PREV_OR_HER_INPUT-",
+        read_values=values,
+        value="",
+        disabled=True,
+        tooltip=tt_prev_or_her_input_dis,
+    )
 
-        # Check events
-        if event == "Open model":
-            filename = sg.popup_get_file(
-                "Open model",
-                no_window=True,  # To use a native approach
-                file_types=(("Comma separated values", "*.csv"),),
-                modal=True,  # Work in all platforms (native approach)
-            )
-            if not filename:
-                continue  # The operation has been canceled
+    # Update informative banner
+    update_info_banner(window, "-INFO_STATE_READY-")  # Discard any calculation
+    update_info_banner(window, "CLEAN")  # Clean all model related
+
+
+def handle_save_table(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Save the calculated penetrance table to a file selected by the
+    user."""
+    import pytoxo.errors
+
+    if not pytoxo_context.ptable:
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.Hide()
+        popup_ok(
+            f"There is not a calculated penetrance table. Calculate "
+            f"the table before trying to save it.",
+            title="No penetrance table",
+        )
+        if hide_windows_to_emulate_modal_dep_of_platform:
+            window.UnHide()
+    else:
+        # Get configured output format
+        output_format = values["-FORMATS_CB-"].lower()
+        # Calculate default output file extension attending to output format
+        if output_format == "gametes":
+            output_default_extension = ".txt"
+        else:
+            output_default_extension = ".csv"
+
+        filename = sg.popup_get_file(
+            "Save calculated table",
+            save_as=True,
+            default_extension=output_default_extension,
+            no_window=True,  # To use a native approach
+            modal=True,  # Work in all platforms (native approach)
+        )
+        if not filename:
+            return  # The operation has been canceled
+        else:
             try:
-                # Load to the PyToxo context
-                pytoxo_context.model = pytoxo.Model(filename)
-                pytoxo_context.order = (
-                    pytoxo_context.model.order
-                )  # It is important to update also this
-
-                # Print model in the GUI's table
-                window["-MODEL_TABLE-"].Update(
-                    values=[
-                        [g, p]
-                        for g, p in zip(
-                            pytoxo_context.model.calculate_genotypes(),
-                            pytoxo_context.model.penetrances,
-                        )
-                    ]
-                )
-                """Enable MAFs assuring to prevent from being enabled too 
-                many when changing from a larger model to a smaller one. 
-                Assure also that MAFs are all empty"""
-                for i in range(1, pytoxo_context.model.order + 1):
-                    values[f"-MAFS_INPUT_{i}-"] = ""
-                    window[f"-MAFS_INPUT_{i}-"].Update(
-                        value=values[f"-MAFS_INPUT_{i}-"]
-                    )
-                    window[f"-MAFS_INPUT_{i}-"].Update(visible=True)
-                for i in range(pytoxo_context.model.order + 1, MAX_ORDER_SUPPORTED + 1):
-                    window[f"-MAFS_INPUT_{i}-"].Update(visible=False)
-                    values[f"-MAFS_INPUT_{i}-"] = ""
-                    window[f"-MAFS_INPUT_{i}-"].Update(
-                        value=values[f"-MAFS_INPUT_{i}-"]
-                    )
-                window["-MAFS_DISABLED_TEXT-"].Update(visible=False)
-
-                # Enable prevalence or heritability entry
-                """Note: actually this parameter is independent of the load 
-                of the model. However, thus limiting the order of filling 
-                fields, it is possible to validate this field with the validator
-                of the model, which otherwise might not be available. It also
-                makes the user better understand the order in which the 
-                interface should be used."""
-                window[f"-PREV_OR_HER_INPUT-"].Update(disabled=False)
-                window["-PREV_OR_HER_INPUT-"].set_tooltip(tt_prev_or_her_input_en)
-
-                # Update informative banner
-                update_info_banner(
-                    window,
-                    "-INFO_MODEL-",
-                    pytoxo_context.model.name,
-                    str(pytoxo_context.order),
-                )
-
-                # Refresh text items to check
-                mafs_entries_to_check_keys = refresh_mafs_entries_to_check_keys(
-                    pytoxo_context
-                )
-                text_entries_to_check_keys = refresh_text_entries_to_check_keys(
-                    mafs_entries_to_check_keys
+                pytoxo_context.ptable.write_to_file(
+                    filename=filename, overwrite=True, format=output_format
                 )
-                text_entries_to_check_values = refresh_text_entries_to_check_values(
-                    text_entries_to_check_keys, values
-                )
-            except pytoxo.errors.BadFormedModelError:
-                if hide_windows_to_emulate_modal_dep_of_platform:
-                    window.Hide()
-                sg.popup_ok(
-                    "The file contains a bad formed model. PyToxo cannot "
-                    "interpret it. Revise PyToxo's file format requirements.",
-                    title="File parsing error",
-                    modal=True,
-                    font=window_general_font,
-                )
-                if hide_windows_to_emulate_modal_dep_of_platform:
-                    window.UnHide()
-            except IOError:
+            except pytoxo.errors.GenericCalculationError as e:  # Improvable exception
                 if hide_windows_to_emulate_modal_dep_of_platform:
                     window.Hide()
-                sg.popup_ok(
-                    f"Error trying to open '{filename}'.",
-                    title="File opening error",
-                    modal=True,
-                    font=window_general_font,
+                popup_ok(
+                    format_revise_field_message(e),
+                    title="Saving error",
                 )
                 if hide_windows_to_emulate_modal_dep_of_platform:
                     window.UnHide()
 
-        elif event == "Close model and clean":
-            # Load to the PyToxo context
-            pytoxo_context = PyToxoContext()  # Refresh with a new instance
-
-            # Remove the previous model from the GUI
-            window["-MODEL_TABLE-"].Update(values=empty_rows)
-
-            # Disable MAFs and clean values
-            for k in mafs_entries_to_check_keys:
-                window[k].Update(visible=False)
-                values[k] = ""
-                window[k].Update(value=values[k])
-            window["-MAFS_DISABLED_TEXT-"].Update(visible=True)
-
-            # Disable prevalence or heritability entry and clean values
-            """Note: actually this parameter is independent of the load 
-            of the model. However, thus limiting the order of filling 
-            fields, it is possible to validate this field with the validator
-            of the model, which otherwise might not be available. It also
-            makes the user better understand the order in which the 
-            interface should be used."""
-            values[f"-PREV_OR_HER_CB-"] = ""
-            window[f"-PREV_OR_HER_CB-"].Update(value=values[f"-PREV_OR_HER_CB-"])
-            window[f"-PREV_OR_HER_INPUT-"].Update(disabled=True)
-            window["-PREV_OR_HER_INPUT-"].set_tooltip(tt_prev_or_her_input_dis)
-            values[f"-PREV_OR_HER_INPUT-"] = ""
-            window[f"-PREV_OR_HER_INPUT-"].Update(value=values[f"-PREV_OR_HER_INPUT-"])
-
-            # Update informative banner
-            update_info_banner(window, "CLEAN")  # Clean all model related
-
-            # Refresh text items to check
-            mafs_entries_to_check_keys = refresh_mafs_entries_to_check_keys(
-                pytoxo_context
-            )
-            text_entries_to_check_keys = refresh_text_entries_to_check_keys(
-                mafs_entries_to_check_keys
-            )
-            text_entries_to_check_values = refresh_text_entries_to_check_values(
-                text_entries_to_check_keys, values
-            )
 
-        elif event == "Save calculated table":
-            if not pytoxo_context.ptable:
-                if hide_windows_to_emulate_modal_dep_of_platform:
-                    window.Hide()
-                sg.popup_ok(
-                    f"There is not a calculated penetrance table. Calculate "
-                    f"the table before trying to save it.",
-                    title="No penetrance table",
-                    modal=True,
-                    font=window_general_font,
-                )
-                if hide_windows_to_emulate_modal_dep_of_platform:
-                    window.UnHide()
-            else:
-                # Get configured output format
-                output_format = values["-FORMATS_CB-"].lower()
-                # Calculate default output file extension attending to output format
-                if output_format == "gametes":
-                    output_default_extension = ".txt"
-                else:
-                    output_default_extension = ".csv"
-
-                filename = sg.popup_get_file(
-                    "Save calculated table",
-                    save_as=True,
-                    default_extension=output_default_extension,
-                    no_window=True,  # To use a native approach
-                    modal=True,  # Work in all platforms (native approach)
-                )
-                if not filename:
-                    continue  # The operation has been canceled
-                else:
-                    try:
-                        pytoxo_context.ptable.write_to_file(
-                            filename=filename, overwrite=True, format=output_format
-                        )
-                    except pytoxo.errors.GenericCalculationError as e:  # Improvable exception
-                        # Format error message
-                        msg = e.__str__()
-                        if not msg.endswith("."):
-                            msg = f"{e}."
-
-                        if hide_windows_to_emulate_modal_dep_of_platform:
-                            window.Hide()
-                        sg.popup_ok(
-                            f"{msg} Revise this field.",
-                            title="Saving error",
-                            modal=True,
-                            font=window_general_font,
-                        )
-                        if hide_windows_to_emulate_modal_dep_of_platform:
-                            window.UnHide()
-
-        elif event == "-MODEL_TABLE-":
-            # Intercept the event to refresh window when click on the table
-            pass
-
-        elif event == "-PREV_OR_HER_CB-" and values[event] != "":
-            # Update informative banner
-            fixed_prev_or_her = values[event].lower()
-            if fixed_prev_or_her == info_banner_fixing_maximizing_options[0]:
-                maximized_prev_or_her = info_banner_fixing_maximizing_options[1]
-            else:
-                maximized_prev_or_her = info_banner_fixing_maximizing_options[0]
-            update_info_banner(window, "-INFO_FIXING-", fixed_prev_or_her)
-            update_info_banner(window, "-INFO_MAXIMIZING-", maximized_prev_or_her)
-
-        elif (
-            event == "-PREV_OR_HER_INPUT-"
-            and values[event] != ""
-            and values[event]
-            != "."  # The user is already writing, or it will solved in the next interaction
-        ):
-            """Check input is valid using 'Model' check function. At the
-            final of this loop is checked what fields are filled to update
-            the GUI in consonance"""
-            try:
-                pytoxo_context.model.check_find_table_parameters(
-                    # Simply a valid value to validate th other ignoring this
-                    mafs=[0.0] * pytoxo_context.model.order,
-                    h_or_p=float(
-                        values[event]
-                    ),  # Try cast because actually is a string
-                )
-            except ValueError as e:
-                # Format error message
-                msg = e.__str__()
-                if not msg.endswith("."):
-                    msg = f"{e}."
+def handle_prev_or_her_cb(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Update the informative banner with the fixed and the maximized
+    parameters."""
+    if values[event] == "":
+        return  # Cleaned
+    # Update informative banner
+    fixed_prev_or_her = values[event].lower()
+    if fixed_prev_or_her == info_banner_fixing_maximizing_options[0]:
+        maximized_prev_or_her = info_banner_fixing_maximizing_options[1]
+    else:
+        maximized_prev_or_her = info_banner_fixing_maximizing_options[0]
+    update_info_banner(window, "-INFO_FIXING-", fixed_prev_or_her)
+    update_info_banner(window, "-INFO_MAXIMIZING-", maximized_prev_or_her)
 
-                if hide_windows_to_emulate_modal_dep_of_platform:
-                    window.Hide()
-                sg.popup_ok(
-                    f"{msg} Revise this field.",
-                    title="Input configuration validation error",
-                    modal=True,
-                    font=window_general_font,
-                )
-                if hide_windows_to_emulate_modal_dep_of_platform:
-                    window.UnHide()
 
-                # Remove value
-                window[event].Update(value="")
+def handle_numerical_input_edit(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Handle the edition of a numerical entry."""
+    # Validate the entry when the user stops typing on it
+    pytoxo_context.pending_validations[event] = time.monotonic()
 
-        elif (
-            event.startswith("-MAFS_INPUT_")
-            and values[event] != ""
-            and values[event]
-            != "."  # The user is already writing, or it will solved in the next interaction
-        ):
-            """Check input is valid using 'Model' check function. At the
-            final of this loop is checked what fields are filled to update
-            the GUI in consonance"""
-            try:
-                pytoxo_context.model.check_find_table_parameters(
-                    mafs=[float(values[event])]
-                    * pytoxo_context.model.order,  # Try cast because actually is a string
-                    h_or_p=0.0,  # Simply a valid value to validate th other ignoring this
-                )
-            except ValueError as e:
-                # Format error message
-                msg = e.__str__()
-                if not msg.endswith("."):
-                    msg = f"{e}."
+    # Track the empty entries for the final filled check
+    if values[event] == "":
+        pytoxo_context.empty_keys.add(event)
+    else:
+        pytoxo_context.empty_keys.discard(event)
+
+
+def is_calculating() -> bool:
+    """Check if a penetrance table is still being calculated, even an
+    outdated one. The solver changes the MPMath precision of the whole
+    process (`mpmath.mp.dps`), and MPMath has no per-thread precision, so
+    the GUI loop does not do any SymPy work, as opening a model or
+    validating the entries, meanwhile."""
+    return any(
+        t.name == CALCULATION_THREAD_NAME and t.is_alive()
+        for t in threading.enumerate()
+    )
 
-                if hide_windows_to_emulate_modal_dep_of_platform:
-                    window.Hide()
-                sg.popup_ok(
-                    f"{msg} Revise this field.",
-                    title="Input configuration validation error",
-                    modal=True,
-                    font=window_general_font,
-                )
-                if hide_windows_to_emulate_modal_dep_of_platform:
-                    window.UnHide()
 
-                # Remove value
-                window[event].Update(value="")
-
-        elif event == "Calculate table":
-            """Security check to avoid some stranger cases playing with the
-            input fields"""
-            if check_all_filled(window, values, text_entries_to_check_values):
-                input_mafs = []
-                for k in mafs_entries_to_check_keys:
-                    input_mafs.append(float(values[k]))
-
-                # Update informative banner
-                update_info_banner(window, "-INFO_STATE_CALCULATING-")
-                try:
-                    if values["-PREV_OR_HER_CB-"] == "Heritability":
-                        ptable = pytoxo_context.model.find_max_prevalence_table(
-                            mafs=input_mafs, h=float(values["-PREV_OR_HER_INPUT-"])
-                        )
-                    elif values["-PREV_OR_HER_CB-"] == "Prevalence":
-                        ptable = pytoxo_context.model.find_max_heritability_table(
-                            mafs=input_mafs, p=float(values["-PREV_OR_HER_INPUT-"])
-                        )
+def calculate_table(
+    window: sg.Window,
+    model: "pytoxo.Model",
+    fixed_prev_or_her: str,
+    mafs: List[float],
+    prev_or_her: float,
+) -> None:
+    """Calculate a penetrance table in a worker thread, out of the GUI loop.
+    The table is sent to the loop as a `-CALC_DONE-` event, or the error
+    as a `-CALC_ERROR-` one, both along with the thread. Any error is
+    sent, since an uncaught one would end the thread silently and leave
+    the GUI calculating forever."""
+    try:
+        if fixed_prev_or_her == "Heritability":
+            ptable = model.find_max_prevalence_table(mafs=mafs, h=prev_or_her)
+        else:
+            ptable = model.find_max_heritability_table(mafs=mafs, p=prev_or_her)
+    except Exception as e:
+        window.write_event_value("-CALC_ERROR-", (threading.current_thread(), e))
+    else:
+        window.write_event_value("-CALC_DONE-", (threading.current_thread(), ptable))
+
+
+def handle_calculate_table(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Start calculating the penetrance table with the configured
+    parameters, which is printed in the GUI's table when calculated."""
+    # Validate the entries which the user has just typed on
+    for k in pytoxo_context.pending_validations:
+        validate_numerical_input(window, pytoxo_context, values, k)
+    pytoxo_context.pending_validations.clear()
+
+    """Security check to avoid some stranger cases playing with the
+    input fields"""
+    if check_all_filled(window, values, pytoxo_context):
+        # The focus could be still in a not beautified field
+        for k, entry in pytoxo_context.text_elements.items():
+            if values[k] != beautified_values.get(k):
+                values[k] = beautify_numerical_input(entry)
+
+        input_mafs = [float(values[k]) for k in pytoxo_context.mafs_keys]
+
+        # Update informative banner
+        update_info_banner(window, "-INFO_STATE_CALCULATING-")
+
+        # Calculate out of the loop, to keep the GUI responsive meanwhile
+        pytoxo_context.calculation = threading.Thread(
+            target=calculate_table,
+            args=(
+                window,
+                pytoxo_context.model,
+                values["-PREV_OR_HER_CB-"],
+                input_mafs,
+                float(values["-PREV_OR_HER_INPUT-"]),
+            ),
+            name=CALCULATION_THREAD_NAME,
+            daemon=True,  # It cannot be stopped, so do not wait it to exit
+        )
+        pytoxo_context.calculation.start()
+
+
+def handle_calculation_done(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Print the penetrance table calculated by the last calculation. The
+    previous ones are outdated, e.g. the model has been closed meanwhile."""
+    calculation, ptable = values[event]
+    calculation.join()  # Already finishing, after sending this event
+    if calculation is not pytoxo_context.calculation:
+        return  # Outdated
+    pytoxo_context.calculation = None
+
+    # Update informative banner
+    update_info_banner(window, "-INFO_STATE_READY-")
+
+    """Skip printing the same penetrances already printed, e.g. when
+    calculating the table again. The table is loaded to the PyToxo context
+    anyway, since its other fields may differ, e.g. the fixed parameter,
+    and they are saved with it"""
+    printed_ptable = pytoxo_context.ptable
+    pytoxo_context.ptable = ptable
+    if (
+        printed_ptable is None
+        or printed_ptable.penetrance_values_as_numpy.tobytes()
+        != ptable.penetrance_values_as_numpy.tobytes()
+    ):
+        # Print generated penetrance table in the GUI's table
+        update_model_table(
+            window,
+            map(
+                list,
+                zip(
+                    pytoxo_context.genotypes,
+                    pytoxo_context.penetrances,
+                    ptable.penetrance_values,
+                ),
+            ),
+        )
 
-                    # Load the table to the PyToxo context
-                    # noinspection PyUnboundLocalVariable
-                    pytoxo_context.ptable = ptable
-
-                    # Print generated penetrance table in the GUI's table
-                    # noinspection PyUnboundLocalVariable
-                    window["-MODEL_TABLE-"].Update(
-                        values=[
-                            [g, p, pen]
-                            for g, p, pen in zip(
-                                pytoxo_context.model.calculate_genotypes(),
-                                pytoxo_context.model.penetrances,
-                                ptable.penetrance_values,
-                            )
-                        ]
-                    )
-                except pytoxo.errors.ResolutionError as e:
-                    if hide_windows_to_emulate_modal_dep_of_platform:
-                        window.Hide()
-                    sg.popup_ok(
-                        e.message,
-                        title="Resolution error",
-                        modal=True,
-                        font=window_general_font,
+
+def handle_calculation_error(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Report the error of the last calculation of a penetrance table. The
+    errors of the previous ones are outdated."""
+    import pytoxo.errors
+
+    calculation, e = values[event]
+    calculation.join()  # Already finishing, after sending this event
+    if calculation is not pytoxo_context.calculation:
+        return  # Outdated
+    pytoxo_context.calculation = None
+
+    # Update informative banner
+    update_info_banner(window, "-INFO_STATE_READY-")
+
+    if isinstance(e, pytoxo.errors.ResolutionError):
+        message, title = e.message, "Resolution error"
+    elif isinstance(e, pytoxo.errors.UnsolvableModelError):
+        message, title = e.message, "Unsolvable model error"
+    elif isinstance(e, ValueError):
+        message = f"{e} Check input parameters."
+        title = "Input configuration validation error"
+    else:  # Unexpected
+        message = (
+            f"{getattr(e, 'message', None) or str(e) or type(e).__name__}. "
+            "The table could not be calculated."
+        )
+        title = "Calculation error"
+    if hide_windows_to_emulate_modal_dep_of_platform:
+        window.Hide()
+    popup_ok(message, title=title)
+    if hide_windows_to_emulate_modal_dep_of_platform:
+        window.UnHide()
+
+
+# The "about" window, while it is opened
+about_popup = {}
+
+
+def handle_about(
+    window: sg.Window, values: dict, pytoxo_context: PyToxoContext, event: str
+) -> None:
+    """Show the "about" window."""
+    """This patch is to emulate window modal behaviour on Mac OS. In
+    Linux and Windows, this is innocuous, because the "about" window is
+    modal and the main window will be unresponsive still close the other
+    one. In Mac OS, modal windows are not supported, and previously
+    approach used with popups does not work here. It is also not
+    possible to use popups here, because they do not admit a layout.
+    So, with this patch, at least is limited the opnening of several
+    "about" windows in all platforms. In Mac OS still will be
+    possible to use the main window with the "about" window opened, but
+    it is not very important"""
+    try:
+        # In Mac OS, hide and unhide works, focus doesn't work
+        about_popup["window"].Hide()
+        about_popup["window"].UnHide()
+    except:
+        about_popup["window"] = sg.Window(
+            "About PyToxo GUI",
+            layout=[
+                [
+                    sg.Text(
+                        "PyToxo GUI\nA graphical user interface for PyToxo\n",
+                        justification="center",
                     )
-                    if hide_windows_to_emulate_modal_dep_of_platform:
-                        window.UnHide()
-                except pytoxo.errors.UnsolvableModelError as e:
-                    if hide_windows_to_emulate_modal_dep_of_platform:
-                        window.Hide()
-                    sg.popup_ok(
-                        e.message,
-                        title="Unsolvable model error",
-                        modal=True,
-                        font=window_general_font,
+                ],
+                [sg.Image(data=logo_b64_popup)],
+                [
+                    sg.Text(
+                        "PyToxo\nA Python library for "
+                        "calculating penetrance tables of any "
+                        "bivariate epistasis model\n\nCopyright 2021 Borja "
+                        "González Seoane\nUniversity of A Coruña\nContact: "
+                        "borja.gseoane@udc.es",
+                        justification="center",
                     )
-                    if hide_windows_to_emulate_modal_dep_of_platform:
-                        window.UnHide()
-                except ValueError as e:
-                    if hide_windows_to_emulate_modal_dep_of_platform:
-                        window.Hide()
-                    sg.popup_ok(
-                        f"{e} Check input parameters.",
-                        title="Input configuration validation error",
-                        modal=True,
-                        font=window_general_font,
+                ],
+                [sg.Image(data=logo_udc_b64)],
+            ],
+            font=window_general_font,
+            finalize=True,
+            modal=True,
+            element_justification="center",
+        )
+
+
+"""Handlers of the events, except the edition of the numerical entries,
+which have a key for each entry. Clicks on the table (`-MODEL_TABLE-`) do
+not need a handler: they are skipped by the loop"""
+EVENT_HANDLERS = {
+    "Open model": handle_open_model,
+    "Close model and clean": handle_close_model,
+    "Save calculated table": handle_save_table,
+    "-PREV_OR_HER_CB-": handle_prev_or_her_cb,
+    "Calculate table": handle_calculate_table,
+    "-CALC_DONE-": handle_calculation_done,
+    "-CALC_ERROR-": handle_calculation_error,
+    "About PyToxo GUI": handle_about,
+}
+
+
+# #########################################################
+
+
+# ##################### GUI EVENT LOOP ####################
+def main():
+    # Create PyToxo context object
+    pytoxo_context = PyToxoContext()
+
+    while True:
+        """With a timeout to validate the entries when the user stops
+        typing, only if there are pending validations. Not while
+        calculating, see `is_calculating`, since the end of the
+        calculation is an event itself"""
+        if pytoxo_context.pending_validations and not is_calculating():
+            next_validation_time = (
+                min(pytoxo_context.pending_validations.values()) + VALIDATION_DELAY
+            )
+            # In milliseconds, rounding up to not wake up too early
+            timeout = int((next_validation_time - time.monotonic()) * 1000) + 1
+            event, values = window.read(timeout=max(0, timeout))
+        else:
+            event, values = window.read()
+
+        # Check if exit event
+        if event in ("Exit", sg.WIN_CLOSED, None):
+            break
+        # The clicks on the table do not change anything
+        if event == "-MODEL_TABLE-":
+            continue
+
+        # Check events
+        handler = EVENT_HANDLERS.get(event)
+        if handler is None and event in pytoxo_context.text_keys_set:
+            handler = handle_numerical_input_edit
+        if handler is not None:
+            handler(window, values, pytoxo_context, event)
+
+        """Validate the entries which the user has stopped typing on. At the
+        final of this loop is checked what fields are filled to update the 
+        GUI in consonance"""
+        all_kept = True
+        if not is_calculating():  # Else, validated after the calculation
+            now = time.monotonic()
+            pending = list(pytoxo_context.pending_validations.items())
+            for k, last_change_time in pending:
+                if now - last_change_time >= VALIDATION_DELAY:
+                    del pytoxo_context.pending_validations[k]
+                    all_kept &= validate_numerical_input(
+                        window, pytoxo_context, values, k
                     )
-                    if hide_windows_to_emulate_modal_dep_of_platform:
-                        window.UnHide()
-                finally:
-                    # Update informative banner
-                    update_info_banner(window, "-INFO_STATE_READY-")
-
-        elif event == "About PyToxo GUI":
-            """This patch is to emulate window modal behaviour on Mac OS. In
-            Linux and Windows, this is innocuous, because the "about" window is
-            modal and the main window will be unresponsive still close the other
-            one. In Mac OS, modal windows are not supported, and previously
-            approach used with popups does not work here. It is also not
-            possible to use popups here, because they do not admit a layout.
-            So, with this patch, at least is limited the opnening of several
-            "about" windows in all platforms. In Mac OS still will be
-            possible to use the main window with the "about" window opened, but
-            it is not very important"""
-            try:
-                # In Mac OS, hide and unhide works, focus doesn't work
-                # noinspection PyUnboundLocalVariable
-                about_popup.Hide()
-                about_popup.UnHide()
-            except:
-                about_popup = sg.Window(
-                    "About PyToxo GUI",
-                    layout=[
-                        [
-                            sg.Text(
-                                "PyToxo GUI\nA graphical user interface for "
-                                "PyToxo\n",
-                                justification="center",
-                            )
-                        ],
-                        [sg.Image(data=logo_b64_popup)],
-                        [
-                            sg.Text(
-                                "PyToxo\nA Python library for "
-                                "calculating penetrance tables of any "
-                                "bivariate epistasis model\n\nCopyright 2021 Borja "
-                                "González Seoane\nUniversity of A Coruña\nContact: "
-                                "borja.gseoane@udc.es",
-                                justification="center",
-                            )
-                        ],
-                        [sg.Image(data=logo_udc_b64)],
-                    ],
-                    font=window_general_font,
-                    finalize=True,
-                    modal=True,
-                    element_justification="center",
-                )
 
-        # Finally, check if all is filled before go to the next interaction
-        check_all_filled(window, values, text_entries_to_check_values)
+        """Finally, check if all is filled before go to the next interaction.
+        Only the events which can change it are considered"""
+        filled_may_change = not all_kept or event in pytoxo_context.text_keys_set
+        if filled_may_change or event in (
+            "-PREV_OR_HER_CB-",
+            "Open model",
+            "Close model and clean",
+            "Calculate table",  # Disabled while calculating
+            "-CALC_DONE-",
+            "-CALC_ERROR-",
+        ):
+            check_all_filled(window, values, pytoxo_context)
 
     window.close()
 
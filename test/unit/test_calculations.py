@@ -1419,3 +1419,39 @@ class CalculationsUnitTestSuite(unittest.TestCase):
         output = pytoxo.calculations.compute_heritability(input_penetrances, input_mafs)
 
         self.assertAlmostEqual(expected_output, output)  # Default precision 7 decimals
+
+    def test_scaled_genotype_probabilities(self):
+        """Test that the exact genotype probabilities used by the numeric
+        variants match the symbolic ones, in the same order."""
+        input_mafs = [0.1, 0.25, 0.375]
+
+        expected_output = pytoxo.calculations.genotype_probabilities(input_mafs)
+        output, scale = pytoxo.calculations._scaled_genotype_probabilities(
+            input_mafs
+        )
+
+        self.assertEqual(len(expected_output), len(output))
+        for ev, v in zip(expected_output, output):
+            self.assertEqual(ev, sympy.Rational(v, scale))
+
+    def test_compute_numeric_prevalence_and_heritability(self):
+        """Test that the numeric variants of `compute_prevalence` and
+        `compute_heritability` match the symbolic ones."""
+        input_penetrances = [random.random() for _ in range(27)]
+        input_mafs = [random.uniform(0, 0.5) for _ in range(3)]
+
+        expected_p = pytoxo.calculations.compute_prevalence(
+            input_penetrances, input_mafs
+        )
+        p = pytoxo.calculations.compute_numeric_prevalence(
+            input_penetrances, input_mafs
+        )
+        self.assertAlmostEqual(float(expected_p), p)
+
+        expected_h = pytoxo.calculations.compute_heritability(
+            input_penetrances, input_mafs
+        )
+        h = pytoxo.calculations.compute_numeric_heritability(
+            input_penetrances, input_mafs
+        )
+        self.assertAlmostEqual(float(expected_h), h)
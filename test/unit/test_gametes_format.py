@@ -252,6 +252,87 @@ class GAMETESFormatTestSuite(unittest.TestCase):
         `test_ptable_as_gametes_check_disposition_as_unknown_*` test."""
         self._helper_ptable_as_gametes_check_all_as_toxo(self, 8)
 
+    def test_ptable_as_gametes_header(self):
+        """Test the header of the `PTable` formatted as GAMETES format. The
+        prevalence and the heritability have to be printed with the same
+        precision as `x` and `y`, without floating point noise."""
+        m = pytoxo.model.Model(os.path.join("models", "additive_2.csv"))
+        pt = m.find_max_prevalence_table(mafs=[0.3, 0.3], h=0.1)
+        pt_as_gametes = pt._compound_table_as_gametes().splitlines()
+
+        self.assertEqual("Attribute names:\tP0\tP1", pt_as_gametes[0])
+        self.assertEqual("Minor allele frequencies:\t0.300\t0.300", pt_as_gametes[1])
+        self.assertEqual("Heritability: 0.100000000000000", pt_as_gametes[5])
+
+        # Same number of significant digits in all the numeric fields
+        significant_digits = [
+            len(l.split(": ")[1].replace(".", "").lstrip("0"))
+            for l in pt_as_gametes[2:6]
+        ]
+        self.assertEqual([15] * 4, significant_digits)
+
+    def test_ptable_as_gametes_header_across_models(self):
+        """Test the prevalence and the heritability of the header of the
+        `PTable` formatted as GAMETES format across several models. The
+        fixed one has to be printed as given, and the calculated one as the
+        symbolic calculation did, without floating point noise in the last
+        digit."""
+        # Model, MAFs, fixed heritability or prevalence and the header lines
+        cases = [
+            (
+                "additive_2",
+                [0.1, 0.25],
+                "p",
+                "Prevalence: 0.100000000000000",
+                "Heritability: 0.0621753858867924",
+            ),
+            (
+                "additive_3",
+                [0.3, 0.3, 0.3],
+                "p",
+                "Prevalence: 0.100000000000000",
+                "Heritability: 0.0791516751245089",
+            ),
+            (
+                "multiplicative_2",
+                [0.1, 0.25],
+                "p",
+                "Prevalence: 0.100000000000000",
+                "Heritability: 0.0164784715727662",
+            ),
+            (
+                "multiplicative_3",
+                [0.3, 0.3, 0.3],
+                "h",
+                "Prevalence: 0.00779660290531079",
+                "Heritability: 0.100000000000000",
+            ),
+            (
+                "threshold_2",
+                [0.3, 0.3],
+                "h",
+                "Prevalence: 0.778532730701308",
+                "Heritability: 0.100000000000000",
+            ),
+            (
+                "threshold_3",
+                [0.1, 0.25, 0.4],
+                "p",
+                "Prevalence: 0.100000000000000",
+                "Heritability: 0.505703422053232",
+            ),
+        ]
+        for model, mafs, fixed, prevalence, heritability in cases:
+            m = pytoxo.model.Model(os.path.join("models", f"{model}.csv"))
+            if fixed == "h":
+                pt = m.find_max_prevalence_table(mafs=mafs, h=0.1)
+            else:
+                pt = m.find_max_heritability_table(mafs=mafs, p=0.1)
+            pt_as_gametes = pt._compound_table_as_gametes().splitlines()
+
+            self.assertEqual(prevalence, pt_as_gametes[4], model)
+            self.assertEqual(heritability, pt_as_gametes[5], model)
+
     @staticmethod
     def _helper_ptable_as_gametes_check_all_as_toxo(test, test_order):
         """Helper method with the test skeleton for the test of
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+###########################################################
+# PyToxo
+#
+# A Python tool to calculate penetrance tables for 
+# high-order epistasis models
+#
+# Copyright 2021 Borja González Seoane
+#
+# Contact: borja.gseoane@udc.es
+###########################################################
+
+"""PyToxo GUI unit test suite."""
+
+import importlib.util
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pytoxo.errors
+
+"""The GUI module needs PySimpleGUI, an optional dependency. It builds its
+window and prepares its logos when imported, so it is imported with a stub
+window class, not to need a display nor to open any window, and with the
+user directories in a temporary one, not to write into the real logos
+cache"""
+gui = None
+user_dir = tempfile.TemporaryDirectory()
+if importlib.util.find_spec("PySimpleGUI") is not None:
+    user_dirs = {
+        "HOME": user_dir.name,
+        "USERPROFILE": user_dir.name,
+        "XDG_CACHE_HOME": user_dir.name,
+        "LOCALAPPDATA": user_dir.name,
+    }
+    with mock.patch.dict(os.environ, user_dirs), mock.patch("PySimpleGUI.Window"):
+        import pytoxo_gui.__main__ as gui
+
+
+def tearDownModule():
+    user_dir.cleanup()
+
+
+class StubWindow:
+    """Window which only records the events written to it."""
+
+    def __init__(self):
+        self.events = []
+
+    def write_event_value(self, key, value):
+        self.events.append((key, value))
+
+
+class FailingModel:
+    """Model whose calculations fail with a generic calculation error."""
+
+    def find_max_prevalence_table(self, mafs, h):
+        raise pytoxo.errors.GenericCalculationError("find_max_prevalence_table")
+
+    def find_max_heritability_table(self, mafs, p):
+        raise pytoxo.errors.GenericCalculationError("find_max_heritability_table")
+
+
+@unittest.skipUnless(gui, "PySimpleGUI is not installed")
+class GUIUnitTestSuite(unittest.TestCase):
+    """Tests for the GUI helpers which do not need a real window."""
+
+    def test_calculate_table_unexpected_error(self):
+        """Test that an unexpected error calculating a table is sent to the
+        GUI loop as a `-CALC_ERROR-` event, instead of ending the worker
+        thread silently."""
+        for fixed_prev_or_her in ["Heritability", "Prevalence"]:
+            window = StubWindow()
+            gui.calculate_table(
+                window, FailingModel(), fixed_prev_or_her, [0.1, 0.1], 0.1
+            )
+            self.assertEqual(len(window.events), 1)
+            key, (calculation, e) = window.events[0]
+            self.assertEqual(key, "-CALC_ERROR-")
+            self.assertIs(calculation, threading.current_thread())
+            self.assertIsInstance(e, pytoxo.errors.GenericCalculationError)
+
+    def test_is_calculating(self):
+        """Test that a running calculation thread is detected, so the GUI
+        loop does not do SymPy work meanwhile."""
+        self.assertFalse(gui.is_calculating())
+
+        finish = threading.Event()
+        calculation = threading.Thread(
+            target=finish.wait, name=gui.CALCULATION_THREAD_NAME, daemon=True
+        )
+        calculation.start()
+        try:
+            self.assertTrue(gui.is_calculating())
+        finally:
+            finish.set()
+            calculation.join()
+        self.assertFalse(gui.is_calculating())
+
+    def test_logos_cache_dir_at_import(self):
+        """Test that the logos prepared when importing the GUI module in
+        these tests are not cached in the real user cache directory."""
+        self.assertTrue(gui.LOGOS_CACHE_DIR.startswith(user_dir.name))
+        self.assertTrue(os.listdir(gui.LOGOS_CACHE_DIR))
+
+    def test_prepare_logo_broken_cache(self):
+        """Test that a truncated cached logo is not used, but resized and
+        cached again."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.object(gui, "LOGOS_CACHE_DIR", cache_dir):
+                logo_b64 = gui.prepare_logo(gui.logo_udc_dep_of_style, 100)
+                [cache_filename] = os.listdir(cache_dir)
+                cache_filename = os.path.join(cache_dir, cache_filename)
+                with open(cache_filename, "rb") as f:
+                    gif = f.read()
+                self.assertTrue(gui.is_complete_gif(gif, 100))
+
+                # Truncate the cached logo, e.g. an interrupted write
+                with open(cache_filename, "wb") as f:
+                    f.write(gif[: len(gif) // 2])
+                self.assertFalse(gui.is_complete_gif(gif[: len(gif) // 2], 100))
+
+                self.assertEqual(
+                    logo_b64, gui.prepare_logo(gui.logo_udc_dep_of_style, 100)
+                )
+                with open(cache_filename, "rb") as f:
+                    self.assertEqual(gif, f.read())
+                self.assertEqual(1, len(os.listdir(cache_dir)))  # No temporary
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1282,6 +1282,14 @@ class ModelUnitTestSuite(unittest.TestCase):
         self.assertNotEqual(m3, m4)
         self.assertEqual(m4, m4)
 
+    def test_genotypes_cache(self):
+        """Test the genotypes are computed once per model and match the
+        ones of `calculate_genotypes`."""
+        m = pytoxo.model.Model(filename=os.path.join("models", "multiplicative_2.csv"))
+        self.assertEqual(m.calculate_genotypes(), m.genotypes.tolist())
+        self.assertIs(m.genotypes, m.genotypes)
+        self.assertFalse(m.genotypes.flags.writeable)
+
     def test_probabilities_sort(self):
         """Test that the probability expressions are sorted attending to
         genotype definitions alphabetical sort. This is necessary to assert the association between
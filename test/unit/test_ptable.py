@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+###########################################################
+# PyToxo
+#
+# A Python tool to calculate penetrance tables for
+# high-order epistasis models
+#
+# Copyright 2021 Borja González Seoane
+#
+# Contact: borja.gseoane@udc.es
+###########################################################
+
+"""PyToxo penetrance table unit test suite."""
+
+import os
+import tempfile
+import unittest
+
+import numpy
+import sympy
+
+import pytoxo.model
+import pytoxo.ptable
+
+
+class PTableUnitTestSuite(unittest.TestCase):
+    """Tests for `pytoxo/ptable.py` at unit level.
+
+    Warnings
+    --------
+    Tests are sensible to model file `models/additive_2.csv`.
+    """
+
+    def setUp(self):
+        self.model = pytoxo.model.Model(os.path.join("models", "additive_2.csv"))
+        self.mafs = [0.3, 0.3]
+        self.h = 0.1
+
+    def test_ptable_hash(self):
+        """Test that penetrance tables are hashable, also when the
+        prevalence and heritability are still not calculated, and that the
+        hash is structural."""
+        pt1 = self.model.find_max_prevalence_table(self.mafs, self.h)
+        pt2 = self.model.find_max_prevalence_table(self.mafs, self.h)
+        pt3 = self.model.find_max_prevalence_table(self.mafs, 0.2)
+
+        self.assertIsNone(pt1.prevalence)
+        self.assertEqual(hash(pt1), hash(pt2))
+        self.assertEqual(pt1, pt2)
+        self.assertNotEqual(pt1, pt3)
+
+        # Usable as dictionary key
+        self.assertEqual(1, len({pt1: None, pt2: None}))
+
+        # The hashed penetrance values cannot be modified from outside
+        with self.assertRaises(ValueError):
+            pt1.penetrance_values_as_numpy[0] = 0.5
+        self.assertEqual(hash(pt1), hash(pt2))
+
+        # The model name takes part in the hash
+        pt2.model_name = "other_name"
+        self.assertNotEqual(pt1, pt2)
+
+        # Not equal to other types
+        self.assertNotEqual(pt1, None)
+        self.assertFalse(pt1 == "table")
+
+        """The fixed heritability or prevalence does not take part in the
+        hash, but in the equality"""
+        pt4 = pytoxo.ptable.PTable(
+            model_order=self.model.order,
+            model_genotypes=self.model.genotypes,
+            model_penetrances=self.model.penetrances,
+            values=dict(zip(self.model.variables, pt1._values)),
+            mafs=self.mafs,
+            prevalence=pt1.heritability,
+        )
+        self.assertEqual(hash(pt1), hash(pt4))
+        self.assertNotEqual(pt1, pt4)
+        pt4.prevalence = None
+        pt4.heritability = self.h
+        self.assertEqual(pt1, pt4)
+
+    def test_write_to_file_as_csv(self):
+        """Test the CSV composition of the penetrance table, one row per
+        genotype with its penetrance."""
+        pt = self.model.find_max_prevalence_table(self.mafs, self.h)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "table.csv")
+            pt.write_to_file(filename, format="csv")
+            with open(filename, "r") as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(len(pt.genotypes), len(lines))
+        for line, genotype, penetrance in zip(
+            lines, pt.genotypes, pt.penetrance_values
+        ):
+            g, p = line.split(",")
+            self.assertEqual(genotype, g)
+            self.assertAlmostEqual(float(penetrance), float(p))
+
+    def test_write_to_file_small_penetrances(self):
+        """Test that the penetrances below 1e-4 are written as Sympy prints
+        them, with an exponent without zero padding, both in the CSV and the
+        GAMETES formats."""
+        pt = pytoxo.ptable.PTable(
+            model_order=self.model.order,
+            model_genotypes=self.model.genotypes,
+            model_penetrances=self.model.penetrances,
+            values=dict(zip(self.model.variables, [1.23456789e-5, 0.5])),
+            mafs=self.mafs,
+        )
+        expected_penetrances = [
+            str(sympy.Float(p, 15)) for p in pt.penetrance_values
+        ]
+        self.assertEqual("1.23456789000000e-5", expected_penetrances[0])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "table.csv")
+            pt.write_to_file(filename, format="csv")
+            with open(filename, "r") as f:
+                lines = f.read().splitlines()
+        self.assertEqual(
+            expected_penetrances, [line.split(",")[1] for line in lines]
+        )
+
+        gametes_table = pt._compound_table_as_gametes().split("Table:\n\n")[1]
+        gametes_penetrances = [
+            p.strip() for p in gametes_table.replace("\n", ",").split(",")
+        ]
+        self.assertEqual(
+            expected_penetrances, [p for p in gametes_penetrances if p]
+        )
+
+    def test_genotypes_as_numpy(self):
+        """Test the genotypes are kept as a read-only Numpy string array
+        shared with the model, and as a list of strings through
+        `genotypes`."""
+        pt = self.model.find_max_prevalence_table(self.mafs, self.h)
+
+        self.assertEqual("U", pt.genotypes_as_numpy.dtype.kind)
+        self.assertTrue(
+            numpy.shares_memory(self.model.genotypes, pt.genotypes_as_numpy)
+        )
+        self.assertEqual(self.model.calculate_genotypes(), pt.genotypes)
+
+        # Mutating them would corrupt the model and its other tables
+        with self.assertRaises(ValueError):
+            pt.genotypes_as_numpy[0] = "aabb"
+
+        # Also read-only when they are not received as the model's array
+        pt = pytoxo.ptable.PTable(
+            model_order=self.model.order,
+            model_genotypes=self.model.calculate_genotypes(),
+            model_penetrances=self.model.penetrances,
+            values=dict(zip(self.model.variables, [0.1, 0.2])),
+        )
+        self.assertFalse(pt.genotypes_as_numpy.flags.writeable)
+
+    def test_write_to_file_checks(self):
+        """Test the checks over the final file name when writing a penetrance
+        table, and the overwriting of an existing file."""
+        pt = self.model.find_max_prevalence_table(self.mafs, self.h)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "table.csv")
+            with open(filename, "w") as f:
+                f.write("Previous content, longer than the table itself. " * 100)
+
+            with self.assertRaises(FileExistsError):
+                pt.write_to_file(filename, format="csv")
+            with self.assertRaises(IsADirectoryError):
+                pt.write_to_file(tmp_dir, overwrite=True, format="csv")
+
+            pt.write_to_file(filename, overwrite=True, format="csv")
+            with open(filename, "r") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(pt.genotypes), len(lines))
+            self.assertTrue(lines[0].startswith(f"{pt.genotypes[0]},"))